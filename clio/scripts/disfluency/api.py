@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""In-process linting for data loaders and notebooks (no file I/O).
+
+    session = LintSession(dedup=True, max_disfluencies=6)
+    verdicts = session.lint_batch([(noisy, clean), ...])
+    batch = [pair for pair, keep in zip(pairs, verdicts.keep) if keep]
+
+Verdicts are compact arrays: a keep mask and Reason bitflags per row.
+"""
+
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+from .lint_dataset import REASON_NAMES, DisfluencyLinter, Reason, Row
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+
+# Reason-string code (text before ':' or '~') -> flag, for reading reports back
+REASON_CODES = {name: code for code, name in REASON_NAMES.items()}
+
+
+def reason_flag(reason: str) -> int:
+    return REASON_CODES[reason.split(":", 1)[0].split("~", 1)[0]]
+
+
+class BatchVerdicts:
+    """Per-row keep mask and Reason bitflags of one batch.
+
+    `keep` and `reasons` are array('B') / array('H'), or NumPy bool / uint16
+    arrays when the session was created with as_numpy=True.
+    """
+
+    __slots__ = ("keep", "reasons")
+
+    def __init__(self, keep, reasons):
+        self.keep = keep
+        self.reasons = reasons
+
+    def __len__(self) -> int:
+        return len(self.keep)
+
+    def kept_indices(self) -> List[int]:
+        return [i for i, k in enumerate(self.keep) if k]
+
+    def reason(self, i: int) -> Reason:
+        return Reason(int(self.reasons[i]))
+
+
+class LintSession:
+    """A DisfluencyLinter scoped to one session.
+
+    With dedup=True, hard/soft duplicates are detected against every row kept
+    earlier in the session (call reset() to start over); with dedup=False each
+    row is linted on its own. Extra keyword arguments go to DisfluencyLinter.
+    """
+
+    __slots__ = ("dedup", "as_numpy", "linter_kwargs", "linter", "_next_idx")
+
+    def __init__(self, dedup: bool = True, as_numpy: bool = False, **linter_kwargs):
+        if as_numpy and np is None:
+            raise ImportError("as_numpy=True requires numpy")
+        self.dedup = dedup
+        self.as_numpy = as_numpy
+        self.linter_kwargs = linter_kwargs
+        self.reset()
+
+    def reset(self):
+        self.linter = DisfluencyLinter(**self.linter_kwargs)
+        self._next_idx = 1
+
+    def lint_pair(self, inp: str, out: str) -> Tuple[bool, int]:
+        """(keep, Reason bitflags) for one pair. Kept rows may still carry the
+        soft TOO_TRIVIAL flag."""
+        row = Row(input=inp, output=out, idx=self._next_idx)
+        self._next_idx += 1
+        return self.linter.lint_flags(row, dedup=self.dedup)
+
+    def lint_batch(self, pairs: Iterable[Tuple[str, str]]) -> BatchVerdicts:
+        keep = array('B')
+        reasons = array('H')
+        for inp, out in pairs:
+            k, flags = self.lint_pair(inp, out)
+            keep.append(k)
+            reasons.append(flags)
+        if self.as_numpy:
+            return BatchVerdicts(np.frombuffer(keep, dtype=np.bool_).copy(),
+                                 np.frombuffer(reasons, dtype=np.uint16).copy())
+        return BatchVerdicts(keep, reasons)
+
+
+def filter_pairs(pairs: List[Tuple[str, str]], session: Optional[LintSession] = None) -> List[Tuple[str, str]]:
+    """Convenience: the pairs of `pairs` a session keeps."""
+    session = session or LintSession()
+    verdicts = session.lint_batch(pairs)
+    return [p for p, k in zip(pairs, verdicts.keep) if k]
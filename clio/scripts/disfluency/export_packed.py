@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .lint_dataset import Row, iter_jsonl
+
+# Shard layout
+#   <prefix>-NNNNN.bin  concatenated UTF-8: input_0 output_0 input_1 output_1 ...
+#   <prefix>-NNNNN.idx  header (magic, version, n) + 2n+1 uint64 byte offsets into
+#                       the .bin (pair i = [off[2i], off[2i+1]) / [off[2i+1], off[2i+2]))
+#                       + n uint64 source row indices; little-endian
+#   <prefix>.manifest.json  shard list, row counts and length buckets
+MAGIC = b"DFPK"
+VERSION = 1
+HEADER = struct.Struct("<4sIQ")
+
+
+def _le(a: array) -> array:
+    if sys.byteorder != "little":
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a
+
+
+class _ShardWriter:
+    """Streams rows into <prefix>-NNNNN.bin/.idx, starting a new shard every
+    `shard_rows` rows; only the current shard's offsets and ids are held."""
+
+    def __init__(self, prefix: str, shard_rows: Optional[int] = None):
+        self.prefix = prefix
+        self.shard_rows = shard_rows
+        self.shards: List[Dict] = []
+        self.rows = 0
+        self._bin = None
+        os.makedirs(os.path.dirname(prefix) or ".", exist_ok=True)
+
+    def _open(self):
+        self._base = f"{self.prefix}-{len(self.shards):05d}"
+        self._bin = open(self._base + ".bin", 'wb')
+        self._pos = 0
+        self._offsets = array('Q', [0])
+        self._ids = array('Q')
+
+    def _finish(self):
+        self._bin.close()
+        self._bin = None
+        n = len(self._ids)
+        with open(self._base + ".idx", 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, n))
+            _le(self._offsets).tofile(f)
+            _le(self._ids).tofile(f)
+        self.shards.append({"bin": os.path.basename(self._base + ".bin"),
+                            "idx": os.path.basename(self._base + ".idx"), "rows": n})
+
+    def write(self, idx: int, a: bytes, b: bytes):
+        if self._bin is None:
+            self._open()
+        for part in (a, b):
+            self._bin.write(part)
+            self._pos += len(part)
+            self._offsets.append(self._pos)
+        self._ids.append(idx)
+        self.rows += 1
+        if self.shard_rows and len(self._ids) >= self.shard_rows:
+            self._finish()
+
+    def close(self) -> List[Dict]:
+        # An empty export still gets one (empty) shard
+        if self._bin is not None or not self.shards:
+            if self._bin is None:
+                self._open()
+            self._finish()
+        return self.shards
+
+
+def _write_manifest(prefix: str, writer: _ShardWriter, bucket_width: Optional[int] = None,
+                    buckets: Sequence[Tuple[int, int, int]] = ()) -> Dict:
+    manifest = {
+        "format": "disfluency-packed",
+        "version": VERSION,
+        "rows": writer.rows,
+        "bucket_width": bucket_width,
+        "buckets": [{"min_bytes": key * bucket_width, "start": start, "end": end} for key, start, end in buckets],
+        "shards": writer.shards,
+    }
+    with open(prefix + ".manifest.json", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def pack_rows(rows: Iterable[Row], prefix: str, shard_rows: Optional[int] = None) -> Dict:
+    """Stream pairs, in order, into memory-mappable shards of `shard_rows` rows
+    (default: one shard); returns the manifest (also saved as
+    <prefix>.manifest.json). For length buckets use pack_jsonl().
+    """
+    writer = _ShardWriter(prefix, shard_rows)
+    for r in rows:
+        writer.write(r.idx, r.input.encode('utf-8'), r.output.encode('utf-8'))
+    writer.close()
+    return _write_manifest(prefix, writer)
+
+
+def pack_jsonl(path: str, prefix: str, shard_rows: Optional[int] = None,
+               bucket_width: Optional[int] = None) -> Dict:
+    """Pack the pairs of a JSONL file; see pack_rows().
+
+    bucket_width: order rows by (input+output UTF-8 length) // bucket_width so
+    neighbouring rows have similar lengths; the manifest records each bucket's
+    [start, end) global row range. A first pass keeps only each row's line and
+    bucket; a second pass reads the rows in bucket order through the line index.
+    """
+    if not bucket_width:
+        return pack_rows(iter_jsonl(path), prefix, shard_rows=shard_rows)
+
+    lines = array('Q')
+    keys = array('Q')
+    for r in iter_jsonl(path):
+        lines.append(r.idx)
+        keys.append((len(r.input.encode('utf-8')) + len(r.output.encode('utf-8'))) // bucket_width)
+    # Stable: rows of one bucket keep their file order
+    order = array('Q', sorted(range(len(keys)), key=keys.__getitem__))
+
+    buckets: List[Tuple[int, int, int]] = []
+    for i, j in enumerate(order):
+        if buckets and buckets[-1][0] == keys[j]:
+            buckets[-1] = (keys[j], buckets[-1][1], i + 1)
+        else:
+            buckets.append((keys[j], i, i + 1))
+    del keys
+
+    writer = _ShardWriter(prefix, shard_rows)
+    for r in iter_jsonl(path, lines=(lines[j] for j in order)):
+        writer.write(r.idx, r.input.encode('utf-8'), r.output.encode('utf-8'))
+    writer.close()
+    return _write_manifest(prefix, writer, bucket_width, buckets)
+
+
+class _Shard:
+    def __init__(self, directory: str, meta: Dict):
+        self.n = meta["rows"]
+        self._files = []
+        self._maps = []
+        # Views over the idx map, released (innermost first) by close()
+        self._views: List[memoryview] = []
+        try:
+            self.data = self._map(os.path.join(directory, meta["bin"]))
+            idx = self._map(os.path.join(directory, meta["idx"]))
+            magic, version, n = HEADER.unpack_from(idx, 0)
+            if magic != MAGIC or version != VERSION or n != self.n:
+                raise ValueError(f"bad packed index: {meta['idx']}")
+            if sys.byteorder != "little":
+                raise ValueError("packed shards are little-endian; zero-copy reads need a little-endian host")
+            base = self._view(memoryview(idx))
+            words = self._view(base[HEADER.size:].cast('Q'))
+            self.offsets = self._view(words[:2 * n + 1])
+            self.ids = self._view(words[2 * n + 1:3 * n + 1])
+        except BaseException:
+            self.close()
+            raise
+
+    def _map(self, path: str):
+        f = open(path, 'rb')
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(m)
+        return m
+
+    def _view(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def close(self) -> bool:
+        """Release the views and close files and maps; True if the data map
+        could not be closed because raw() views of it are still alive."""
+        for view in reversed(self._views):
+            view.release()
+        for f in self._files:
+            f.close()
+        exported = False
+        for m in self._maps:
+            try:
+                m.close()
+            except BufferError:
+                exported = True
+        return exported
+
+
+class PackedPairs:
+    """Random access over packed shards without JSON decoding.
+
+    `raw(i)` returns zero-copy memoryviews of the UTF-8 input/output bytes;
+    `pairs[i]` decodes them. Rows are numbered globally across shards in the
+    order they were written.
+    """
+
+    def __init__(self, manifest_path: str):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        directory = os.path.dirname(os.path.abspath(manifest_path))
+        self._shards: List[_Shard] = []
+        try:
+            for meta in self.manifest["shards"]:
+                self._shards.append(_Shard(directory, meta))
+        except BaseException:
+            self._close_shards()
+            raise
+        self._starts = array('Q', [0])
+        for sh in self._shards:
+            self._starts.append(self._starts[-1] + sh.n)
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    def _locate(self, i: int) -> Tuple[_Shard, int]:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        lo, hi = 0, len(self._shards) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._starts[mid] <= i:
+                lo = mid
+            else:
+                hi = mid - 1
+        return self._shards[lo], i - self._starts[lo]
+
+    def raw(self, i: int) -> Tuple[memoryview, memoryview]:
+        sh, j = self._locate(i)
+        a, b, c = sh.offsets[2 * j], sh.offsets[2 * j + 1], sh.offsets[2 * j + 2]
+        view = memoryview(sh.data)
+        return view[a:b], view[b:c]
+
+    def __getitem__(self, i: int) -> Tuple[str, str]:
+        a, b = self.raw(i)
+        return str(a, 'utf-8'), str(b, 'utf-8')
+
+    def source_idx(self, i: int) -> int:
+        sh, j = self._locate(i)
+        return sh.ids[j]
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def batches(self, batch_size: int, seed: int = 0, shuffle: bool = True) -> Iterator[List[int]]:
+        """Row-index batches. With length buckets, each batch is drawn from one
+        bucket (rows shuffled inside it) and batch order is shuffled."""
+        rng = random.Random(seed)
+        spans = [(b["start"], b["end"]) for b in self.manifest.get("buckets") or []] or [(0, len(self))]
+        out: List[List[int]] = []
+        for start, end in spans:
+            ids = list(range(start, end))
+            if shuffle:
+                rng.shuffle(ids)
+            out.extend(ids[k:k + batch_size] for k in range(0, len(ids), batch_size))
+        if shuffle:
+            rng.shuffle(out)
+        return iter(out)
+
+    def _close_shards(self) -> bool:
+        # Close every shard; True if some still had raw() views alive
+        exported = False
+        for sh in self._shards:
+            exported |= sh.close()
+        return exported
+
+    def close(self):
+        if self._close_shards():
+            raise BufferError("release the memoryviews returned by PackedPairs.raw() before closing")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Pack cleaned input/output pairs into memory-mappable binary shards")
+    ap.add_argument("--in", dest="inp", required=True, help="Cleaned JSONL (input/output pairs)")
+    ap.add_argument("--out", dest="out", required=True, help="Output prefix, e.g. packed/data (writes data-00000.bin/.idx and data.manifest.json)")
+    ap.add_argument("--shard-rows", dest="shard_rows", type=int, default=None, help="Rows per shard (default: one shard)")
+    ap.add_argument("--bucket-width", dest="bucket_width", type=int, default=None, help="Order rows into length buckets of this many UTF-8 bytes")
+    args = ap.parse_args()
+
+    manifest = pack_jsonl(args.inp, args.out, shard_rows=args.shard_rows, bucket_width=args.bucket_width)
+    print(json.dumps({"rows": manifest["rows"], "shards": len(manifest["shards"]), "buckets": len(manifest["buckets"])}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
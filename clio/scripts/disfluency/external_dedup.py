@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import csv
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import tempfile
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .lint_dataset import Row, iter_jsonl, row_to_json
+from .utils import canonical_pair
+
+# Run records: 16-byte canonical fingerprint + 8-byte big-endian row ordinal.
+# Sorting the raw bytes orders by (fingerprint, ordinal), so the first record of
+# each fingerprint group is the first occurrence in input order.
+FP_BYTES = 16
+RECORD_BYTES = FP_BYTES + 8
+# Rough in-memory cost of one buffered record (bytes object + list slot)
+_RECORD_OVERHEAD = 72
+
+
+def fingerprint(r: Row) -> bytes:
+    return hashlib.blake2b(canonical_pair(r.input, r.output).encode('utf-8'), digest_size=FP_BYTES).digest()
+
+
+def iter_rows(paths: List[str]) -> Iterator[Tuple[str, Row]]:
+    for path in paths:
+        for r in iter_jsonl(path):
+            yield path, r
+
+
+def _spill(records: List[bytes], tmp_dir: str) -> str:
+    records.sort()
+    fd, path = tempfile.mkstemp(prefix="dedup-run-", suffix=".bin", dir=tmp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(b''.join(records))
+    return path
+
+
+def _read_run(path: str, block_records: int = 4096) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(RECORD_BYTES * block_records)
+            if not block:
+                break
+            for i in range(0, len(block), RECORD_BYTES):
+                yield block[i:i + RECORD_BYTES]
+
+
+def _merge_runs(runs: List[str], tmp_dir: str, fan_in: int) -> List[str]:
+    # Reduce the number of runs so the final k-way merge keeps <= fan_in files open
+    while len(runs) > fan_in:
+        merged: List[str] = []
+        for i in range(0, len(runs), fan_in):
+            group = runs[i:i + fan_in]
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            fd, path = tempfile.mkstemp(prefix="dedup-run-", suffix=".bin", dir=tmp_dir)
+            with os.fdopen(fd, 'wb') as f:
+                for rec in heapq.merge(*[_read_run(p) for p in group]):
+                    f.write(rec)
+            for p in group:
+                os.remove(p)
+            merged.append(path)
+        runs = merged
+    return runs
+
+
+def external_dedup(paths: List[str],
+                   out_path: str,
+                   mem_mb: float = 256,
+                   tmp_dir: Optional[str] = None,
+                   fan_in: int = 64,
+                   bitmap_path: Optional[str] = None,
+                   on_drop: Optional[Callable[[str, Row], None]] = None) -> Dict[str, int]:
+    """Exact (canonical-pair) dedup across JSONL files larger than RAM.
+
+    Pass 1 streams rows, spilling sorted fingerprint runs of at most `mem_mb`;
+    the runs are k-way merged to mark every repeat after the first occurrence in
+    a drop bitmap (one bit per row, memory-mapped). Pass 2 streams the rows again
+    and writes the survivors. The result matches in-memory hard dedup
+    (DisfluencyLinter(hard_dedup_only=True)) over the concatenated inputs,
+    up to 128-bit fingerprint collisions.
+    """
+    per_run = max(1024, int(mem_mb * 1024 * 1024) // _RECORD_OVERHEAD)
+    with tempfile.TemporaryDirectory(prefix="dedup-", dir=tmp_dir) as work:
+        # Pass 1: fingerprints -> sorted runs
+        runs: List[str] = []
+        buf: List[bytes] = []
+        n = 0
+        for _, r in iter_rows(paths):
+            buf.append(fingerprint(r) + n.to_bytes(8, 'big'))
+            n += 1
+            if len(buf) >= per_run:
+                runs.append(_spill(buf, work))
+                buf = []
+        if buf:
+            runs.append(_spill(buf, work))
+        buf = []
+
+        # Merge: mark repeats in the drop bitmap
+        bitmap_file = bitmap_path or os.path.join(work, "drop.bitmap")
+        size = max(1, (n + 7) // 8)
+        with open(bitmap_file, 'wb') as f:
+            f.truncate(size)
+        dropped = 0
+        with open(bitmap_file, 'r+b') as f, mmap.mmap(f.fileno(), size) as bitmap:
+            prev = None
+            for rec in heapq.merge(*[_read_run(p) for p in _merge_runs(runs, work, fan_in)]):
+                fp = rec[:FP_BYTES]
+                if fp == prev:
+                    ordinal = int.from_bytes(rec[FP_BYTES:], 'big')
+                    bitmap[ordinal >> 3] |= 1 << (ordinal & 7)
+                    dropped += 1
+                prev = fp
+
+            # Pass 2: apply the bitmap
+            os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+            with open(out_path, 'w', encoding='utf-8') as fo:
+                for ordinal, (path, r) in enumerate(iter_rows(paths)):
+                    if bitmap[ordinal >> 3] & (1 << (ordinal & 7)):
+                        if on_drop is not None:
+                            on_drop(path, r)
+                        continue
+                    fo.write(json.dumps(row_to_json(r), ensure_ascii=False) + "\n")
+
+    return {"input_rows": n, "kept_rows": n - dropped, "removed_rows": dropped, "runs": len(runs)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Disk-based exact dedup across JSONL batches larger than RAM")
+    ap.add_argument("--in", dest="inp", nargs='+', required=True, help="Input JSONL files (input/output pairs), in priority order")
+    ap.add_argument("--out", dest="out", required=True, help="Path to write deduplicated JSONL")
+    ap.add_argument("--report", dest="report", default=None, help="Optional CSV of dropped rows (path, idx, reason)")
+    ap.add_argument("--mem-mb", dest="mem_mb", type=float, default=256, help="Memory budget for in-memory sort runs")
+    ap.add_argument("--tmp-dir", dest="tmp_dir", default=None, help="Directory for spilled runs (default: system temp)")
+    ap.add_argument("--fan-in", dest="fan_in", type=int, default=64, help="Maximum runs merged at once")
+    ap.add_argument("--bitmap", dest="bitmap", default=None, help="Optional path to keep the drop bitmap (one bit per row, LSB-first)")
+    args = ap.parse_args()
+
+    report_f = None
+    on_drop = None
+    if args.report:
+        os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+        report_f = open(args.report, 'w', encoding='utf-8', newline='')
+        w = csv.writer(report_f)
+        w.writerow(["path", "idx", "reason"])
+
+        def on_drop(path: str, r: Row):
+            w.writerow([path, r.idx, "hard_duplicate"])
+
+    try:
+        stats = external_dedup(args.inp, args.out,
+                               mem_mb=args.mem_mb,
+                               tmp_dir=args.tmp_dir,
+                               fan_in=args.fan_in,
+                               bitmap_path=args.bitmap,
+                               on_drop=on_drop)
+    finally:
+        if report_f is not None:
+            report_f.close()
+
+    print(json.dumps(stats, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
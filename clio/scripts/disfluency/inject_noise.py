@@ -3,85 +3,169 @@
 
 import argparse
 import json
+import math
 import os
 import random
-from typing import List, Dict
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Dict, Iterator, Optional, Tuple
 
-from .utils import normalize_text
+from .jsonl_index import LineIndex, parse_shard
+from .utils import normalize_text, disfluency_count, code_switch_ratio, FULLWIDTH_MAP, Span
 
 ZH_FILLERS = ["嗯", "呃", "啊", "那个", "就是", "你知道吧", "怎么说", "就是说", "那什么", "额", "哎"]
 EN_FILLERS = ["um", "uh", "like", "you know", "i mean", "kind of", "sort of", "basically", "literally"]
 SELF_EN = ["sorry", "i meant", "correction", "i misspoke"]
 SELF_ZH = ["不是", "哦不对", "更准确说是", "更正", "我刚刚说错了", "纠正一下", "我的意思是"]
 
-def inject_fillers(text: str, rng: random.Random) -> str:
-    t = text
+_RE_WS = re.compile(r"\s+")
+
+@dataclass
+class SpanEdit:
+    """Replace original[start:end] with `text`; start == end is a pure insertion."""
+    start: int
+    end: int
+    text: str
+    op: str
+
+
+def apply_edits(text: str, edits: List[SpanEdit]) -> str:
+    """Materialize span edits (all relative to the original `text`) in one pass.
+
+    Edits are applied in offset order; insertions at the same offset keep their
+    emission order. An edit starting inside a span already replaced is dropped.
+    """
+    pieces: List[str] = []
+    cursor = 0
+    for e in sorted(edits, key=lambda e: (e.start, e.end)):
+        if e.start < cursor:
+            continue
+        pieces.append(text[cursor:e.start])
+        pieces.append(e.text)
+        cursor = e.end
+    pieces.append(text[cursor:])
+    return ''.join(pieces)
+
+
+def inject_fillers(text: str, rng: random.Random) -> List[SpanEdit]:
     # Insert a filler before random commas or clause breaks
     positions = []
-    for i, ch in enumerate(t):
+    for i, ch in enumerate(text):
         if ch in [',', '，', '。', '—', ';', '；']:
             positions.append(i)
+    edits: List[SpanEdit] = []
     k = rng.randint(0, min(2, max(0, len(positions)//4)))
     for _ in range(k):
         if not positions:
             break
         i = rng.choice(positions)
         filler = rng.choice(ZH_FILLERS + EN_FILLERS)
-        t = t[:i] + (" " + filler + ", ") + t[i:]
-    return t
+        edits.append(SpanEdit(i, i, " " + filler + ", ", "filler"))
+    return edits
 
 
-def inject_repetitions(text: str, rng: random.Random) -> str:
-    words = list(text)
-    if len(words) < 2:
-        return text
-    idxs = [i for i,ch in enumerate(words) if ch.strip() and ch != '—']
+def inject_repetitions(text: str, rng: random.Random) -> List[SpanEdit]:
+    if len(text) < 2:
+        return []
+    idxs = [i for i,ch in enumerate(text) if ch.strip() and ch != '—']
     if not idxs:
-        return text
+        return []
     i = rng.choice(idxs)
     # repeat a token with comma or dash
-    rep = words[i]
+    rep = text[i]
     style = rng.choice([', ', '—'])
-    words.insert(i+1, style + rep)
-    return ''.join(words)
+    return [SpanEdit(i+1, i+1, style + rep, "repetition")]
 
 
-def inject_restart(text: str, rng: random.Random) -> str:
+def inject_restart(text: str, rng: random.Random) -> List[SpanEdit]:
     # add an em-dash restart somewhere mid-sentence
-    t = text
-    if len(t) < 6:
-        return t
-    i = rng.randint(1, max(1, len(t)-2))
-    return t[:i] + '—' + t[i:]
+    if len(text) < 6:
+        return []
+    i = rng.randint(1, max(1, len(text)-2))
+    return [SpanEdit(i, i, '—', "restart")]
+
 
+def _split_first_comma(text: str) -> Optional[Tuple[int, int]]:
+    # (end of clause A, start of clause B) around the first comma, whitespace excluded
+    c = text.find(',')
+    if c < 0:
+        return None
+    a_end = len(text[:c].rstrip())
+    b_start = len(text) - len(text[c+1:].lstrip())
+    if not text[:a_end].strip() or b_start >= len(text):
+        return None
+    return a_end, b_start
 
-def inject_parenthetical_not_but(text: str, rng: random.Random) -> str:
+
+def inject_parenthetical_not_but(text: str, rng: random.Random) -> List[SpanEdit]:
     # Convert a neutral clause into a parenthetical contrast: "not A, but B"
     # Heuristic: split on first comma and wrap
-    parts = text.split(',')
-    if len(parts) >= 2:
-        A = parts[0].strip()
-        B = ','.join(parts[1:]).strip()
-        if A and B:
-            return f"{A}— not the former, but {B}"
-    return text
+    split = _split_first_comma(text)
+    if split is None:
+        return []
+    a_end, b_start = split
+    return [SpanEdit(a_end, b_start, "— not the former, but ", "parenthetical")]
 
 
-def inject_self_correction(text: str, rng: random.Random) -> str:
+def inject_self_correction(text: str, rng: random.Random) -> List[SpanEdit]:
     # Add a clear self-correction marker, ensuring delete-only gold remains original text
-    parts = text.split(',')
-    if len(parts) >= 2:
-        A = parts[0].strip()
-        B = ','.join(parts[1:]).strip()
-        if A and B:
-            marker = rng.choice(SELF_EN + SELF_ZH)
-            return f"{A}. {marker}, {B}"
-    return text
+    split = _split_first_comma(text)
+    if split is None:
+        return []
+    a_end, b_start = split
+    marker = rng.choice(SELF_EN + SELF_ZH)
+    return [SpanEdit(a_end, b_start, f". {marker}, ", "self_correction")]
 
 
-def synthesize(clean: str, seed: int, density: int = 3) -> str:
-    rng = random.Random(seed)
-    t = clean
+def materialize_with_spans(text: str, edits: List[SpanEdit]) -> Tuple[str, Optional[List[Span]]]:
+    """Like normalize_text(apply_edits(text, edits)), also returning inserted spans.
+
+    Normalization is applied piecewise so inserted-text offsets can be tracked in
+    the final string; spans are trimmed of surrounding whitespace. If piecewise
+    normalization ever disagrees with whole-string normalization (exotic NFKC
+    compositions across an edit boundary), spans are None.
+    """
+    pieces: List[Tuple[str, Optional[str]]] = []
+    cursor = 0
+    for e in sorted(edits, key=lambda e: (e.start, e.end)):
+        if e.start < cursor:
+            continue
+        pieces.append((text[cursor:e.start], None))
+        pieces.append((e.text, e.op))
+        cursor = e.end
+    pieces.append((text[cursor:], None))
+
+    buf: List[str] = []
+    spans: List[Span] = []
+    n = 0
+    after_space = True  # drops leading whitespace like str.strip()
+    for t, op in pieces:
+        t = _RE_WS.sub(" ", unicodedata.normalize("NFKC", t).translate(FULLWIDTH_MAP))
+        if after_space and t.startswith(" "):
+            t = t[1:]
+        if not t:
+            continue
+        if op is not None:
+            lead = len(t) - len(t.lstrip(" "))
+            trail = len(t.rstrip(" "))
+            if trail > lead:
+                spans.append((n + lead, n + trail, op))
+        buf.append(t)
+        n += len(t)
+        after_space = t.endswith(" ")
+    noisy = "".join(buf)
+    if noisy.endswith(" "):
+        noisy = noisy[:-1]
+
+    expected = normalize_text(apply_edits(text, edits))
+    if noisy != expected:
+        return expected, None
+    return noisy, spans
+
+
+def plan_edits(clean: str, rng: random.Random, density: int = 3) -> List[SpanEdit]:
     ops = [inject_fillers, inject_repetitions, inject_restart]
     # optionally add one of parenthetical or self-correction
     if rng.random() < 0.5:
@@ -89,9 +173,169 @@ def synthesize(clean: str, seed: int, density: int = 3) -> str:
     else:
         ops.append(inject_self_correction)
     rng.shuffle(ops)
+    # Every operator plans edits against the clean text; materialize once
+    edits: List[SpanEdit] = []
     for i in range(min(density, len(ops))):
-        t = ops[i](t, rng)
-    return normalize_text(t)
+        edits.extend(ops[i](clean, rng))
+    return edits
+
+
+def synthesize(clean: str, seed: int, density: int = 3) -> str:
+    edits = plan_edits(clean, random.Random(seed), density)
+    return normalize_text(apply_edits(clean, edits))
+
+
+def synthesize_with_spans(clean: str, seed: int, density: int = 3) -> Tuple[str, Optional[List[Span]]]:
+    """Same output as `synthesize`, plus the inserted (start, end, op) spans in it."""
+    edits = plan_edits(clean, random.Random(seed), density)
+    return materialize_with_spans(clean, edits)
+
+
+class DensityTarget:
+    """Target histogram over input disfluency counts, plus an optional ratio_latin band.
+
+    The histogram weights are turned into per-bin quotas for `total` rows.
+    Candidates are measured with the same utils heuristics the linter uses and
+    are wanted only while their bin is in the histogram and under its quota.
+    """
+
+    def __init__(self, histogram: Dict[int, float], total: int,
+                 latin_band: Optional[Tuple[float, float]] = None):
+        weight = float(sum(v for v in histogram.values() if v > 0))
+        if weight <= 0:
+            raise ValueError("target histogram must have positive weight")
+        self.quotas = {k: math.ceil(total * v / weight) for k, v in histogram.items() if v > 0}
+        self.latin_band = latin_band
+        self.filled: Counter = Counter()
+        self.recorded = 0
+
+    def measure(self, noisy: str) -> Optional[int]:
+        """Return the disfluency bin if the candidate is wanted, else None."""
+        dcount = disfluency_count(noisy)
+        if self.filled[dcount] >= self.quotas.get(dcount, 0):
+            return None
+        if self.latin_band is not None:
+            low, high = self.latin_band
+            if not (low <= code_switch_ratio(noisy)["ratio_latin"] <= high):
+                return None
+        return dcount
+
+    def record(self, dcount: int):
+        self.filled[dcount] += 1
+        self.recorded += 1
+
+
+def parse_histogram(spec: str) -> Dict[int, float]:
+    """Parse "2:1,3:2,4:2" into {2: 1.0, 3: 2.0, 4: 2.0}."""
+    hist: Dict[int, float] = {}
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        k, v = part.split(':', 1)
+        hist[int(k)] = float(v)
+    return hist
+
+
+def parse_band(spec: str) -> Tuple[float, float]:
+    low, high = spec.split(',', 1)
+    return float(low), float(high)
+
+
+def synthesize_targeted(clean: str, rng: random.Random, target: DensityTarget,
+                        density: int = 3, max_tries: int = 8,
+                        annotate: bool = False) -> Optional[Tuple[str, Optional[List[Span]], int]]:
+    """Rejection-sample operator plans until the candidate lands in an under-filled bin.
+
+    The first try uses `density` operators; retries also resample the density so
+    both sparse and dense bins can be reached. Returns (noisy, spans, bin) or None,
+    with spans only computed when `annotate` is set; the caller decides when to
+    `target.record(bin)`.
+    """
+    for attempt in range(max_tries):
+        d = density if attempt == 0 else rng.randint(1, 4)
+        seed = rng.randint(0, 10_000_000)
+        if annotate:
+            noisy, spans = synthesize_with_spans(clean, seed=seed, density=d)
+        else:
+            noisy, spans = synthesize(clean, seed=seed, density=d), None
+        dcount = target.measure(noisy)
+        if dcount is not None:
+            return noisy, spans, dcount
+    return None
+
+
+def read_seeds(path: str, shard: Optional[Tuple[int, int]] = None) -> Iterator[str]:
+    """Yield clean sentences from a seeds JSONL ({'clean'|'output'|'text': str} per line).
+
+    shard=(i, n) reads only the i-th of n byte-balanced line ranges (via the
+    <path>.offsets index).
+    """
+    with open(path, 'rb') as fi:
+        if shard is None:
+            lines = iter(fi)
+        else:
+            index = LineIndex.open(path)
+            first, last = index.shard_range(*shard)
+            fi.seek(index.offsets[first])
+            lines = (fi.readline() for _ in range(first, last))
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            clean = obj.get('clean') or obj.get('output') or obj.get('text')
+            if clean:
+                yield clean
+
+
+def inject_file(inp: str, out: str, seed: int = 42, density: int = 3,
+                target_hist: Optional[Dict[int, float]] = None,
+                latin_band: Optional[Tuple[float, float]] = None,
+                max_tries: int = 8, emit_spans: bool = False,
+                shard: Optional[Tuple[int, int]] = None) -> Dict:
+    """Synthesize one noisy pair per clean seed in `inp` and write them to `out`.
+
+    shard=(i, n) processes only the i-th byte-balanced slice of the seeds, with
+    its own random stream, so slices can run as separate jobs.
+    """
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+
+    cleans = list(read_seeds(inp, shard=shard))
+    target = None
+    if target_hist:
+        target = DensityTarget(target_hist, len(cleans), latin_band)
+
+    rng = random.Random(seed if shard is None else f"{seed}/{shard[0]}")
+    written = 0
+    skipped = 0
+    with open(out, 'w', encoding='utf-8') as fo:
+        for clean in cleans:
+            spans = None
+            if target is None:
+                row_seed = rng.randint(0, 10_000_000)
+                if emit_spans:
+                    noisy, spans = synthesize_with_spans(clean, seed=row_seed, density=density)
+                else:
+                    noisy = synthesize(clean, seed=row_seed, density=density)
+            else:
+                hit = synthesize_targeted(clean, rng, target, density=density,
+                                          max_tries=max_tries, annotate=emit_spans)
+                if hit is None:
+                    skipped += 1
+                    continue
+                noisy, spans, dcount = hit
+                target.record(dcount)
+            obj = {"input": noisy, "output": clean}
+            if spans is not None:
+                obj["spans"] = [list(sp) for sp in spans]
+            fo.write(json.dumps(obj, ensure_ascii=False) + "\n")
+            written += 1
+
+    stats = {"seeds": len(cleans), "written_rows": written, "skipped_seeds": skipped}
+    if target is not None:
+        stats["histogram"] = {str(k): f"{target.filled[k]}/{q}" for k, q in sorted(target.quotas.items())}
+    return stats
 
 
 def main():
@@ -100,25 +344,25 @@ def main():
     ap.add_argument("--out", dest="out", required=True, help="Path to write JSONL with {'input','output'} pairs")
     ap.add_argument("--seed", dest="seed", type=int, default=42, help="Global random seed")
     ap.add_argument("--density", dest="density", type=int, default=3, help="Disfluency operations per sample")
+    ap.add_argument("--target-hist", dest="target_hist", default=None, help="Target histogram over input disfluency counts, e.g. '2:1,3:2,4:2,5:1' (enables rejection sampling)")
+    ap.add_argument("--latin-band", dest="latin_band", default=None, help="Accepted ratio_latin band for targeted synthesis, e.g. '0.2,0.8'")
+    ap.add_argument("--max-tries", dest="max_tries", type=int, default=8, help="Candidates sampled per seed in targeted mode before skipping it")
+    ap.add_argument("--emit-spans", dest="emit_spans", action="store_true", help="Add a 'spans' field with inserted [start, end, op] character spans of the input")
+    ap.add_argument("--shard", dest="shard", type=parse_shard, default=None, help="Only synthesize from byte-balanced shard I/N of the seeds (0-based; uses the <in>.offsets index)")
     args = ap.parse_args()
 
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    stats = inject_file(args.inp, args.out,
+                        seed=args.seed,
+                        density=args.density,
+                        target_hist=parse_histogram(args.target_hist) if args.target_hist else None,
+                        latin_band=parse_band(args.latin_band) if args.latin_band else None,
+                        max_tries=args.max_tries,
+                        emit_spans=args.emit_spans,
+                        shard=args.shard)
 
-    rng = random.Random(args.seed)
-    with open(args.inp, 'r', encoding='utf-8') as fi, open(args.out, 'w', encoding='utf-8') as fo:
-        for line in fi:
-            line = line.strip()
-            if not line:
-                continue
-            obj = json.loads(line)
-            clean = obj.get('clean') or obj.get('output') or obj.get('text')
-            if not clean:
-                continue
-            seed = rng.randint(0, 10_000_000)
-            noisy = synthesize(clean, seed=seed, density=args.density)
-            fo.write(json.dumps({"input": noisy, "output": clean}, ensure_ascii=False) + "\n")
+    if "histogram" in stats:
+        print(json.dumps(stats, ensure_ascii=False))
 
 
 if __name__ == "__main__":
     main()
-
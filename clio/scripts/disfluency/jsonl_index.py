@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Sidecar <file>.offsets: header (magic, file size, mtime_ns, line count,
+# blake2b-128 of the content) + line count + 1 little-endian uint64 line start
+# offsets (the last one is the file size).
+MAGIC = b"DFOFFS01"
+HEADER = struct.Struct("<8sQQQ16s")
+_CHUNK = 1 << 20
+
+
+def index_path(path: str) -> str:
+    return path + ".offsets"
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse 'I/N' (0-based shard I of N)."""
+    try:
+        i, n = (int(x) for x in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"bad shard spec {spec!r}, expected I/N") from None
+    if not 0 <= i < n:
+        raise ValueError(f"bad shard spec {spec!r}: need 0 <= I < N")
+    return i, n
+
+
+def _scan(path: str) -> Tuple[array, bytes]:
+    # One pass: line starts and content checksum
+    offsets = array('Q', [0])
+    h = hashlib.blake2b(digest_size=16)
+    pos = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_CHUNK), b''):
+            h.update(block)
+            nl = block.find(b"\n")
+            while nl >= 0:
+                offsets.append(pos + nl + 1)
+                nl = block.find(b"\n", nl + 1)
+            pos += len(block)
+    if offsets[-1] != pos:
+        # Last line without a trailing newline
+        offsets.append(pos)
+    return offsets, h.digest()
+
+
+def _checksum(path: str) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_CHUNK), b''):
+            h.update(block)
+    return h.digest()
+
+
+class LineIndex:
+    """Byte offsets of every line of a text file, for O(1) line access.
+
+    Lines are 0-based here; JSONL rows elsewhere use 1-based line numbers
+    (row idx = line + 1).
+    """
+
+    def __init__(self, path: str, offsets: array, checksum: bytes):
+        self.path = path
+        self.offsets = offsets
+        self.checksum = checksum
+        self._f = None
+
+    @classmethod
+    def build(cls, path: str, write: bool = True) -> "LineIndex":
+        offsets, checksum = _scan(path)
+        idx = cls(path, offsets, checksum)
+        if write:
+            try:  # best effort: the dataset may live on a read-only path
+                idx.save()
+            except OSError:
+                pass
+        return idx
+
+    @classmethod
+    def load(cls, path: str) -> Optional["LineIndex"]:
+        """Load the sidecar if it matches the file, else None.
+
+        Size and mtime are checked first; a file with the same size but a new
+        mtime (e.g. a copy) is re-hashed and, if the content matches, accepted
+        and its sidecar header updated to the new mtime.
+        """
+        try:
+            st = os.stat(path)
+            with open(index_path(path), 'rb') as f:
+                magic, size, mtime_ns, n, checksum = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or size != st.st_size:
+                    return None
+                offsets = array('Q')
+                offsets.fromfile(f, n + 1)
+        except (OSError, EOFError, struct.error):
+            return None
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        if mtime_ns != st.st_mtime_ns:
+            if _checksum(path) != checksum:
+                return None
+            # Same content: record the new mtime so later opens skip the hash
+            try:
+                with open(index_path(path), 'r+b') as f:
+                    f.write(HEADER.pack(MAGIC, st.st_size, st.st_mtime_ns, n, checksum))
+            except OSError:
+                pass
+        return cls(path, offsets, checksum)
+
+    @classmethod
+    def open(cls, path: str, write: bool = True) -> "LineIndex":
+        """Reuse a valid sidecar or build (and by default try to save) a new one."""
+        return cls.load(path) or cls.build(path, write=write)
+
+    def save(self):
+        st = os.stat(self.path)
+        offsets = self.offsets
+        if sys.byteorder != "little":
+            offsets = array('Q', offsets)
+            offsets.byteswap()
+        tmp = index_path(self.path) + f".tmp-{os.getpid()}"
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, st.st_size, st.st_mtime_ns, len(self), self.checksum))
+                offsets.tofile(f)
+            os.replace(tmp, index_path(self.path))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _file(self):
+        if self._f is None:
+            self._f = open(self.path, 'rb')
+        return self._f
+
+    def line(self, i: int) -> bytes:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        f = self._file()
+        f.seek(self.offsets[i])
+        return f.read(self.offsets[i + 1] - self.offsets[i])
+
+    def lines(self, indices: Iterable[int]) -> Iterator[Tuple[int, bytes]]:
+        for i in indices:
+            yield i, self.line(i)
+
+    def nonblank(self) -> List[int]:
+        """Lines long enough to hold a JSON object (cheap blank-line filter)."""
+        off = self.offsets
+        return [i for i in range(len(self)) if off[i + 1] - off[i] > 3]
+
+    def shard_range(self, shard: int, num_shards: int) -> Tuple[int, int]:
+        """[start, end) lines of byte-balanced shard `shard` of `num_shards`."""
+        total = self.offsets[-1]
+
+        def cut(k: int) -> int:
+            return min(len(self), bisect_left(self.offsets, total * k // num_shards))
+
+        return cut(shard), cut(shard + 1)
+
+    def byte_range(self, start: int, end: int) -> Tuple[int, int]:
+        return self.offsets[start], self.offsets[end]
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -5,15 +5,23 @@ import argparse
 import csv
 import json
 import os
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Tuple
+from collections import Counter
+from dataclasses import dataclass, asdict, field
+from enum import IntFlag
+from functools import cached_property, lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from .jsonl_index import LineIndex, parse_shard
 from .utils import (
     normalize_text,
-    canonical_pair,
-    pair_skeleton,
+    canonical_text,
+    skeletonize,
     soft_sim,
-    new_tokens_in_output,
+    content_tokens,
+    deleted_spans,
+    new_tokens,
+    verify_spans,
+    Span,
     numbers_with_units,
     has_self_correction,
     has_parenthetical_not_but,
@@ -28,12 +36,69 @@ class Row:
     input: str
     output: str
     idx: int
+    # Inserted (start, end, op) spans of `input`, when the synthesizer annotated them
+    spans: Optional[List[Span]] = None
+    # Per-row features computed while linting (see FEATURE_COLUMNS), when emitted
+    features: Optional[Dict] = None
+    # Byte offset of the row's line in the source file, when read from one
+    offset: Optional[int] = None
+
+
+class Reason(IntFlag):
+    HARD_DUPLICATE = 1 << 0
+    SOFT_DUPLICATE = 1 << 1
+    DELETE_ONLY = 1 << 2
+    ENTITY = 1 << 3
+    TOO_TRIVIAL = 1 << 4
+    TOO_NOISY = 1 << 5
+    PARENTHETICAL = 1 << 6
+    GRAMMAR = 1 << 7
+
+
+# Report-string code of each Reason (text before ':' or '~')
+REASON_NAMES: Dict[Reason, str] = {
+    Reason.HARD_DUPLICATE: "hard_duplicate",
+    Reason.SOFT_DUPLICATE: "soft_duplicate",
+    Reason.DELETE_ONLY: "delete_only_violation",
+    Reason.ENTITY: "entity_violation",
+    Reason.TOO_TRIVIAL: "too_trivial",
+    Reason.TOO_NOISY: "too_noisy",
+    Reason.PARENTHETICAL: "parenthetical_artifact",
+    Reason.GRAMMAR: "grammar_artifact",
+}
+
+# What dedup and the lint rules find: a Reason plus the raw detail its report
+# string is built from (a dup idx, a disfluency count, artifacts, ...).
+# Strings are only formatted for reports, see format_reason().
+Finding = Tuple[Reason, object]
+
+
+def format_reason(code: Reason, detail: object = None) -> str:
+    """Report string of a finding, e.g. "too_noisy:disfluency_count=8"."""
+    name = REASON_NAMES[code]
+    if code == Reason.HARD_DUPLICATE:
+        return name
+    if code == Reason.SOFT_DUPLICATE:
+        return f"{name}~{detail}"
+    if code in (Reason.TOO_TRIVIAL, Reason.TOO_NOISY):
+        return f"{name}:disfluency_count={detail}"
+    if code == Reason.PARENTHETICAL:
+        return name + ":" + "+".join(detail)
+    if code == Reason.DELETE_ONLY and not isinstance(detail, str):
+        return name + ":new_tokens=" + ",".join(detail)
+    return f"{name}:{detail}"
 
 
 @dataclass
 class Verdict:
     keep: bool
-    reasons: List[str]
+    findings: List[Finding]
+    features: Dict = field(default_factory=dict)
+
+
+# Features the linter computes anyway; emitted with --emit-features so
+# balancing/stats/curriculum stages need not rerun the text heuristics.
+FEATURE_COLUMNS = ["disfluency_count", "ratio_latin", "numbers_with_units", "skeleton"]
 
 
 @dataclass
@@ -42,6 +107,163 @@ class ReportRow:
     reason: str
     input: str
     output: str
+    offset: Optional[int] = None
+    # idx of the earlier row a duplicate matched
+    dup_idx: Optional[int] = None
+
+
+class OutputAnalysis:
+    """Output-side values, computed lazily and shared by every row with the same
+    clean target (synthesis produces many noisy inputs per output)."""
+
+    def __init__(self, output: str):
+        self.output = output
+
+    @cached_property
+    def canon(self) -> str:
+        return canonical_text(self.output)
+
+    @cached_property
+    def skeleton(self) -> str:
+        return skeletonize(self.output)
+
+    @cached_property
+    def content_tokens(self) -> List[Tuple[str, int, int]]:
+        return content_tokens(self.output)
+
+    @cached_property
+    def tokens(self) -> Counter:
+        return Counter(t for t, _, _ in self.content_tokens)
+
+    @cached_property
+    def numbers(self) -> frozenset:
+        return frozenset(numbers_with_units(self.output))
+
+    @cached_property
+    def artifacts(self) -> List[str]:
+        return grammar_artifacts(self.output)
+
+
+class RowContext:
+    """Per-row values shared by the lint rules, computed at most once and only
+    when a rule (or feature emission) asks for them."""
+
+    def __init__(self, row: Row, oa: OutputAnalysis, share_sims: bool = False):
+        self.row = row
+        self.oa = oa
+        # Soft-dedup similarities keyed by the earlier skeleton; only kept when
+        # several linters scan overlapping windows for the same row (--compare)
+        self.sims: Optional[Dict[str, float]] = {} if share_sims else None
+
+    @cached_property
+    def canon(self) -> str:
+        return canonical_text(self.row.input) + " || " + self.oa.canon
+
+    @cached_property
+    def skeleton(self) -> str:
+        return skeletonize(self.row.input) + " || " + self.oa.skeleton
+
+    @cached_property
+    def input_tokens(self) -> List[Tuple[str, int, int]]:
+        return content_tokens(self.row.input)
+
+    @cached_property
+    def deletions(self) -> Optional[List[Tuple[int, int]]]:
+        """Deleted (start, end) spans of normalize_text(input), or None if the
+        output is not a delete-only edit of the input."""
+        return deleted_spans(self.input_tokens, self.oa.content_tokens)
+
+    @cached_property
+    def input_numbers(self) -> List[str]:
+        return numbers_with_units(self.row.input)
+
+    @cached_property
+    def dcount(self) -> int:
+        return disfluency_count(self.row.input)
+
+    @cached_property
+    def ratio_latin(self) -> float:
+        return code_switch_ratio(self.row.input)["ratio_latin"]
+
+    def features(self) -> Dict:
+        return {
+            "disfluency_count": self.dcount,
+            "ratio_latin": self.ratio_latin,
+            "numbers_with_units": self.input_numbers,
+        }
+
+
+@dataclass(frozen=True)
+class LintRule:
+    name: str
+    # Relative cost estimate; the fast mode evaluates cheaper rules first
+    cost: float
+    # Hard violations make a row un-keepable; soft ones are only reported
+    hard: bool
+    check: Callable[["DisfluencyLinter", RowContext], List[Finding]]
+
+
+def _check_delete_only(linter: "DisfluencyLinter", ctx: RowContext) -> List[Finding]:
+    # Output tokens must be the input tokens with some deleted (same order).
+    # Annotated rows only need their spans checked (cheaper, and order-aware).
+    r = ctx.row
+    if r.spans is not None:
+        if not verify_spans(r.input, r.output, r.spans):
+            return [(Reason.DELETE_ONLY, "span_mismatch")]
+        return []
+    if ctx.deletions is not None:
+        return []
+    # Not a subsequence: report added tokens if any, otherwise a reordering
+    new_toks = new_tokens(Counter(t for t, _, _ in ctx.input_tokens), ctx.oa.tokens)
+    if new_toks:
+        return [(Reason.DELETE_ONLY, new_toks[:6])]
+    return [(Reason.DELETE_ONLY, "reordered")]
+
+
+def _check_entities(linter: "DisfluencyLinter", ctx: RowContext) -> List[Finding]:
+    # Entity lock: numbers/units must not change
+    if ctx.oa.numbers - set(ctx.input_numbers):
+        return [(Reason.ENTITY, "numbers_units_changed")]
+    return []
+
+
+def _check_too_trivial(linter: "DisfluencyLinter", ctx: RowContext) -> List[Finding]:
+    # Allowed through (trivial rows are filtered separately during balancing), but reported
+    if ctx.dcount < linter.min_disfluencies:
+        return [(Reason.TOO_TRIVIAL, ctx.dcount)]
+    return []
+
+
+def _check_too_noisy(linter: "DisfluencyLinter", ctx: RowContext) -> List[Finding]:
+    if ctx.dcount > linter.max_disfluencies:
+        return [(Reason.TOO_NOISY, ctx.dcount)]
+    return []
+
+
+def _check_parenthetical(linter: "DisfluencyLinter", ctx: RowContext) -> List[Finding]:
+    # A parenthetical "not A, but B" (without self-correction markers) must keep
+    # its relation in the output; basic grammar check
+    arts = ctx.oa.artifacts
+    if arts and has_parenthetical_not_but(ctx.row.input) and not has_self_correction(ctx.row.input):
+        return [(Reason.PARENTHETICAL, arts)]
+    return []
+
+
+def _check_grammar(linter: "DisfluencyLinter", ctx: RowContext) -> List[Finding]:
+    return [(Reason.GRAMMAR, a) for a in ctx.oa.artifacts]
+
+
+# Declaration order is the report order of the full mode.
+DEFAULT_RULES: List[LintRule] = [
+    LintRule("delete_only", cost=8.0, hard=True, check=_check_delete_only),
+    LintRule("entity_lock", cost=3.0, hard=True, check=_check_entities),
+    LintRule("too_trivial", cost=4.0, hard=False, check=_check_too_trivial),
+    LintRule("too_noisy", cost=4.0, hard=True, check=_check_too_noisy),
+    LintRule("parenthetical", cost=1.5, hard=True, check=_check_parenthetical),
+    LintRule("grammar", cost=1.0, hard=True, check=_check_grammar),
+]
+
+LINT_MODES = ("full", "fast")
 
 
 class DisfluencyLinter:
@@ -50,12 +272,26 @@ class DisfluencyLinter:
                  min_disfluencies: int = 2,
                  max_disfluencies: int = 6,
                  target_ratio_latin: Tuple[float, float] = (0.2, 0.8),
-                 hard_dedup_only: bool = False):
+                 hard_dedup_only: bool = False,
+                 emit_features: bool = False,
+                 output_cache_size: int = 4096,
+                 mode: str = "full",
+                 rules: Optional[List[LintRule]] = None):
+        """mode: "full" evaluates every rule (audit report); "fast" evaluates rules
+        by ascending cost and stops at the first hard violation."""
+        if mode not in LINT_MODES:
+            raise ValueError(f"unknown lint mode: {mode}")
         self.soft_dup_threshold = soft_dup_threshold
         self.min_disfluencies = min_disfluencies
         self.max_disfluencies = max_disfluencies
         self.target_ratio_latin = target_ratio_latin
         self.hard_dedup_only = hard_dedup_only
+        self.emit_features = emit_features
+        self.mode = mode
+        self.rules = list(rules if rules is not None else DEFAULT_RULES)
+        self._fast_rules = sorted(self.rules, key=lambda rule: rule.cost)
+        # Bounded LRU of OutputAnalysis keyed by the output string
+        self._analyze_output = lru_cache(maxsize=output_cache_size)(OutputAnalysis)
         self._seen_canon: Dict[str, int] = {}
         self._skeleton_index: List[Tuple[str, int]] = []
 
@@ -64,169 +300,410 @@ class DisfluencyLinter:
         report: List[ReportRow] = []
 
         for r in rows:
-            # Hard dedup by canonical hash
-            canon = canonical_pair(r.input, r.output)
-            if canon in self._seen_canon:
-                report.append(ReportRow(r.idx, "hard_duplicate", r.input, r.output))
-                continue
-
-            if not self.hard_dedup_only:
-                # Soft dedup: near-duplicate skeletons
-                sk = pair_skeleton(r.input, r.output)
-                is_soft_dup = False
-                for sk_prev, idx_prev in self._skeleton_index[-2000:]:  # recent window for speed
-                    if soft_sim(sk, sk_prev) >= self.soft_dup_threshold:
-                        report.append(ReportRow(r.idx, f"soft_duplicate~{idx_prev}", r.input, r.output))
-                        is_soft_dup = True
-                        break
-                if is_soft_dup:
-                    continue
-
-                verdict = self._lint_row(r)
-                if verdict.keep:
-                    kept.append(r)
-                    self._seen_canon[canon] = r.idx
-                    self._skeleton_index.append((sk, r.idx))
-                else:
-                    for reason in verdict.reasons:
-                        report.append(ReportRow(r.idx, reason, r.input, r.output))
-            else:
-                # Hard-dedup-only mode: keep everything except exact duplicates
+            keep, reports = self.dedup_and_lint_row(r)
+            if keep:
                 kept.append(r)
-                # Still index skeletons for potential later phases (no filtering here)
-                sk = pair_skeleton(r.input, r.output)
-                self._seen_canon[canon] = r.idx
-                self._skeleton_index.append((sk, r.idx))
+            report.extend(reports)
 
         return kept, report
 
-    def _lint_row(self, r: Row) -> Verdict:
-        reasons: List[str] = []
-
-        # Delete-only: output tokens must not introduce new alphanumeric tokens
-        new_toks = new_tokens_in_output(r.input, r.output)
-        if new_toks:
-            reasons.append("delete_only_violation:new_tokens=" + ",".join(new_toks[:6]))
-
-        # Entity lock: numbers/units must not change
-        nums_in = set(numbers_with_units(r.input))
-        nums_out = set(numbers_with_units(r.output))
-        if nums_out - nums_in:
-            reasons.append("entity_violation:numbers_units_changed")
-
-        # Disfluency density on input
-        dcount = disfluency_count(r.input)
-        if dcount < self.min_disfluencies:
-            reasons.append(f"too_trivial:disfluency_count={dcount}")
-        elif dcount > self.max_disfluencies:
-            reasons.append(f"too_noisy:disfluency_count={dcount}")
-
-        # Parenthetical vs self-correction classification
-        has_parenth = has_parenthetical_not_but(r.input)
-        has_self = has_self_correction(r.input)
-        if has_parenth and not has_self:
-            # Output should preserve the parenthetical relation; basic grammar check
-            arts = grammar_artifacts(r.output)
-            if arts:
-                reasons.append("parenthetical_artifact:" + "+".join(arts))
-        if has_self:
-            # Output should remove the wrong part; low-signal heuristic: if output still contains both A and B separated by comma & has self markers removed
-            # We cannot know A/B spans robustly here; leave to human if both appear as in input
-            pass
-
-        # Code-switch ratio (soft constraint; only warn)
-        ratios = code_switch_ratio(r.input)
-        rl = ratios["ratio_latin"]
-        low, high = self.target_ratio_latin
-        if not (low <= rl <= high):
-            # don't block; just warn
-            pass
-
-        # Grammar artifacts generally
-        arts = grammar_artifacts(r.output)
-        for a in arts:
-            reasons.append("grammar_artifact:" + a)
-
-        keep = len([x for x in reasons if not x.startswith("too_trivial")]) == 0
-        # allow trivial filtering separately during balancing; don't keep rows with any hard violations
-        hard = [x for x in reasons if x.startswith("delete_only_violation") or x.startswith("entity_violation") or x.startswith("parenthetical_artifact") or x.startswith("grammar_artifact")]
-        if hard:
-            keep = False
-
-        return Verdict(keep=keep, reasons=reasons)
-
-
-def read_jsonl(path: str) -> List[Row]:
-    rows: List[Row] = []
-    with open(path, 'r', encoding='utf-8') as f:
-        for idx, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except Exception:
-                # lines like "123|{json}" from previews; try to split
-                if '|' in line:
-                    _, rest = line.split('|', 1)
-                    obj = json.loads(rest)
-                else:
-                    continue
-            if not isinstance(obj, dict):
+    def dedup_and_lint_row(self, r: Row, ctx: Optional[RowContext] = None) -> Tuple[bool, List[ReportRow]]:
+        """Dedup + lint a single row against the state accumulated so far.
+
+        Returns (keep, report rows). Kept rows are registered in the dedup
+        indexes, so callers can stream rows through one linter instance.
+        A RowContext may be passed in to share row-side work between linters.
+        """
+        keep, findings = self._dedup_and_check(r, ctx)
+        if keep:
+            return True, []
+        return False, [ReportRow(r.idx, format_reason(code, detail), r.input, r.output, r.offset,
+                                 detail if code in (Reason.HARD_DUPLICATE, Reason.SOFT_DUPLICATE) else None)
+                       for code, detail in findings]
+
+    def lint_flags(self, r: Row, dedup: bool = True) -> Tuple[bool, int]:
+        """(keep, Reason bitflags) of one row, without building report rows or
+        strings. Kept rows may carry soft flags (TOO_TRIVIAL). With dedup=True
+        the row is checked against, and if kept added to, the dedup state as
+        in dedup_and_lint_row(); with dedup=False it is only linted.
+        """
+        ctx = RowContext(r, self._analyze_output(r.output))
+        if dedup:
+            keep, findings = self._dedup_and_check(r, ctx)
+        else:
+            verdict = self._lint_row(r, ctx=ctx)
+            keep, findings = verdict.keep, verdict.findings
+        flags = 0
+        for code, _ in findings:
+            flags |= code
+        return keep, int(flags)
+
+    def register_kept(self, rows: Iterable[Row]) -> int:
+        """Add rows kept elsewhere (e.g. an earlier run's cleaned output) to the
+        dedup indexes without linting them, so later rows are deduplicated
+        against them too; returns the number of rows read."""
+        n = 0
+        for r in rows:
+            ctx = RowContext(r, self._analyze_output(r.output))
+            self._seen_canon.setdefault(ctx.canon, r.idx)
+            self._skeleton_index.append((ctx.skeleton, r.idx))
+            n += 1
+        return n
+
+    def _dedup_and_check(self, r: Row, ctx: Optional[RowContext] = None) -> Tuple[bool, List[Finding]]:
+        if ctx is None:
+            ctx = RowContext(r, self._analyze_output(r.output))
+        # Hard dedup by canonical hash
+        canon = ctx.canon
+        if canon in self._seen_canon:
+            return False, [(Reason.HARD_DUPLICATE, self._seen_canon[canon])]
+
+        if self.hard_dedup_only:
+            # Hard-dedup-only mode: keep everything except exact duplicates
+            # Still index skeletons for potential later phases (no filtering here)
+            self._register(r, ctx, ctx.features() if self.emit_features else {})
+            return True, []
+
+        # Soft dedup: near-duplicate skeletons
+        sk = ctx.skeleton
+        sims = ctx.sims
+        for sk_prev, idx_prev in self._skeleton_index[-2000:]:  # recent window for speed
+            if sims is None:
+                sim = soft_sim(sk, sk_prev)
+            else:
+                sim = sims.get(sk_prev)
+                if sim is None:
+                    sim = sims[sk_prev] = soft_sim(sk, sk_prev)
+            if sim >= self.soft_dup_threshold:
+                return False, [(Reason.SOFT_DUPLICATE, idx_prev)]
+
+        verdict = self._lint_row(r, ctx=ctx)
+        if verdict.keep:
+            self._register(r, ctx, verdict.features)
+        return verdict.keep, verdict.findings
+
+    def _register(self, r: Row, ctx: RowContext, features: Dict):
+        # Add a kept row to the dedup indexes
+        sk = ctx.skeleton
+        self._seen_canon[ctx.canon] = r.idx
+        self._skeleton_index.append((sk, r.idx))
+        if self.emit_features:
+            r.features = {**features, "skeleton": sk}
+
+    def _lint_row(self, r: Row, oa: Optional[OutputAnalysis] = None, ctx: Optional[RowContext] = None) -> Verdict:
+        if ctx is None:
+            if oa is None:
+                oa = self._analyze_output(r.output)
+            ctx = RowContext(r, oa)
+        findings: List[Finding] = []
+        keep = True
+
+        if self.mode == "fast":
+            for rule in self._fast_rules:
+                found = rule.check(self, ctx)
+                findings.extend(found)
+                if found and rule.hard:
+                    # Row is doomed; skip the remaining checks
+                    return Verdict(keep=False, findings=findings)
+        else:
+            for rule in self.rules:
+                found = rule.check(self, ctx)
+                findings.extend(found)
+                if found and rule.hard:
+                    keep = False
+
+        return Verdict(keep=keep, findings=findings, features=ctx.features() if self.emit_features and keep else {})
+
+
+def linter_from_config(cfg: Dict) -> DisfluencyLinter:
+    """Build a linter from a JSON config: DisfluencyLinter keyword arguments,
+    with "rules" optionally naming a subset of DEFAULT_RULES to enable."""
+    cfg = dict(cfg)
+    names = cfg.pop("rules", None)
+    if names is not None:
+        by_name = {rule.name: rule for rule in DEFAULT_RULES}
+        unknown = [n for n in names if n not in by_name]
+        if unknown:
+            raise ValueError(f"unknown lint rules: {', '.join(unknown)}")
+        cfg["rules"] = [by_name[n] for n in names]
+    return DisfluencyLinter(**cfg)
+
+
+def compare_linters(rows: List[Row],
+                    linter_a: DisfluencyLinter,
+                    linter_b: DisfluencyLinter) -> Iterator[Tuple[Row, Tuple[bool, List[str]], Tuple[bool, List[str]]]]:
+    """Run two linters side by side over one pass of `rows`.
+
+    Each row gets one RowContext (input-side heuristics, canonical text,
+    skeleton and soft-dedup similarities) shared by both linters; the dedup
+    states stay separate. Yields (row, (keep_a, reasons_a), (keep_b, reasons_b)).
+    """
+    for r in rows:
+        ctx = RowContext(r, linter_a._analyze_output(r.output), share_sims=True)
+        keep_a, rep_a = linter_a.dedup_and_lint_row(r, ctx)
+        keep_b, rep_b = linter_b.dedup_and_lint_row(r, ctx)
+        yield r, (keep_a, [rr.reason for rr in rep_a]), (keep_b, [rr.reason for rr in rep_b])
+
+
+def compare_file(inp: str, out: str, config_a: str, config_b: str) -> Dict[str, int]:
+    """Write the rows whose verdict differs between two linter configs (JSON files)."""
+    linters = []
+    for path in (config_a, config_b):
+        with open(path, 'r', encoding='utf-8') as f:
+            linters.append(linter_from_config(json.load(f)))
+
+    stats = {"input_rows": 0, "kept_a": 0, "kept_b": 0, "kept_only_a": 0, "kept_only_b": 0, "reasons_changed": 0}
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, 'w', encoding='utf-8') as fo:
+        for r, (keep_a, reasons_a), (keep_b, reasons_b) in compare_linters(iter_jsonl(inp), *linters):
+            stats["input_rows"] += 1
+            stats["kept_a"] += keep_a
+            stats["kept_b"] += keep_b
+            if keep_a != keep_b:
+                stats["kept_only_a" if keep_a else "kept_only_b"] += 1
+            elif reasons_a != reasons_b:
+                stats["reasons_changed"] += 1
+            else:
                 continue
-            inp = obj.get('input', '')
-            out = obj.get('output', '')
-            if inp and out:
-                rows.append(Row(input=inp, output=out, idx=idx))
-    return rows
+            fo.write(json.dumps({
+                "idx": r.idx,
+                "input": r.input,
+                "output": r.output,
+                "a": {"keep": keep_a, "reasons": reasons_a},
+                "b": {"keep": keep_b, "reasons": reasons_b},
+            }, ensure_ascii=False) + "\n")
+    stats["diff_rows"] = stats["kept_only_a"] + stats["kept_only_b"] + stats["reasons_changed"]
+    return stats
+
+
+def parse_row(line, idx: int, offset: Optional[int] = None) -> Optional[Row]:
+    """Parse one JSONL line (str or bytes) into a Row, or None if it holds no pair."""
+    if isinstance(line, bytes):
+        line = line.decode('utf-8')
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        obj = json.loads(line)
+    except Exception:
+        # lines like "123|{json}" from previews; try to split
+        if '|' in line:
+            _, rest = line.split('|', 1)
+            obj = json.loads(rest)
+        else:
+            return None
+    if not isinstance(obj, dict):
+        return None
+    inp = obj.get('input', '')
+    out = obj.get('output', '')
+    if inp and out:
+        spans = obj.get('spans')
+        if spans is not None:
+            spans = [(int(s), int(e), str(op)) for s, e, op in spans]
+        return Row(input=inp, output=out, idx=idx, spans=spans, features=obj.get('features'), offset=offset)
+    return None
+
+
+def iter_jsonl(path: str,
+               shard: Optional[Tuple[int, int]] = None,
+               lines: Optional[Iterable[int]] = None) -> Iterator[Row]:
+    """Stream rows of an input/output JSONL; idx is the 1-based line number.
+
+    shard=(i, n) reads only the i-th of n byte-balanced line ranges; `lines`
+    reads the given 1-based line numbers. Both use the <path>.offsets sidecar
+    (built on first use), and idx stays the line number in the full file.
+    """
+    if lines is not None:
+        with LineIndex.open(path) as index:
+            for i, raw in index.lines(n - 1 for n in lines):
+                r = parse_row(raw, i + 1, index.offsets[i])
+                if r is not None:
+                    yield r
+        return
+    if shard is not None:
+        index = LineIndex.open(path)
+        first, last = index.shard_range(*shard)
+        begin, _ = index.byte_range(first, last)
+        with open(path, 'rb') as f:
+            f.seek(begin)
+            for idx in range(first + 1, last + 1):
+                r = parse_row(f.readline(), idx, index.offsets[idx - 1])
+                if r is not None:
+                    yield r
+        return
+    with open(path, 'rb') as f:
+        pos = 0
+        for idx, line in enumerate(f, start=1):
+            r = parse_row(line, idx, pos)
+            pos += len(line)
+            if r is not None:
+                yield r
+
+
+def read_row(path: str, idx: int) -> Optional[Row]:
+    """O(1) lookup of the row at 1-based line `idx` (e.g. from a soft_duplicate~idx report).
+
+    Returns None if that line holds no row (blank or not a JSON object);
+    raises IndexError if `idx` is not a line of the file (idx < 1 or past the end).
+    """
+    with LineIndex.open(path) as index:
+        if not 1 <= idx <= len(index):
+            raise IndexError(f"row idx {idx} out of range 1..{len(index)} for {path}")
+        return parse_row(index.line(idx - 1), idx, index.offsets[idx - 1])
+
+
+def read_jsonl(path: str, shard: Optional[Tuple[int, int]] = None) -> List[Row]:
+    return list(iter_jsonl(path, shard=shard))
+
 
+def row_to_json(r: Row, features: bool = True) -> Dict:
+    obj = {"input": r.input, "output": r.output}
+    if r.spans is not None:
+        obj["spans"] = [list(sp) for sp in r.spans]
+    if features and r.features is not None:
+        obj["features"] = r.features
+    return obj
 
-def write_jsonl(path: str, rows: List[Row]):
+
+def write_jsonl(path: str, rows: List[Row], features: bool = True):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     with open(path, 'w', encoding='utf-8') as f:
         for r in rows:
-            f.write(json.dumps({"input": r.input, "output": r.output}, ensure_ascii=False) + "\n")
+            f.write(json.dumps(row_to_json(r, features=features), ensure_ascii=False) + "\n")
+
+
+def features_path(jsonl_path: str) -> str:
+    return os.path.splitext(jsonl_path)[0] + ".features.json"
+
+
+def write_features(path: str, rows: List[Row]):
+    """Write a columnar feature sidecar aligned with the row order of the JSONL."""
+    columns: Dict[str, list] = {name: [] for name in FEATURE_COLUMNS}
+    for r in rows:
+        feats = r.features or {}
+        for name in FEATURE_COLUMNS:
+            columns[name].append(feats.get(name))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"rows": len(rows), "columns": columns}, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def read_features(jsonl_path: str) -> Optional[Dict[str, list]]:
+    """Columns of precomputed features for a cleaned JSONL: the sidecar if present,
+    otherwise inline 'features' fields. None when the rows carry no features."""
+    sidecar = features_path(jsonl_path)
+    if os.path.exists(sidecar):
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            return json.load(f)["columns"]
+    columns: Dict[str, list] = {name: [] for name in FEATURE_COLUMNS}
+    for r in iter_jsonl(jsonl_path):
+        if r.features is None:
+            return None
+        for name in FEATURE_COLUMNS:
+            columns[name].append(r.features.get(name))
+    return columns
+
+
+REF_REPORT_HEADER = ["idx", "offset", "reason", "dup_idx"]
+
+
+def report_source_path(report_path: str) -> str:
+    return os.path.splitext(report_path)[0] + ".source.json"
+
 
+def write_report(path: str, report: List[ReportRow], by_ref: bool = False, source: Optional[str] = None):
+    """Write the CSV report; by_ref records (idx, byte offset, reason, dup_idx)
+    instead of copying the row text (resolve rows with view_report).
 
-def write_report(path: str, report: List[ReportRow]):
+    source: the linted JSONL; a by_ref report then records its size and
+    checksum in <report>.source.json, so rows are never resolved against a
+    file that changed since.
+    """
     os.makedirs(os.path.dirname(path), exist_ok=True)
+    if by_ref and source is not None:
+        with LineIndex.open(source) as index:
+            meta = {"data": os.path.basename(source), "size": index.offsets[-1], "checksum": index.checksum.hex()}
+        with open(report_source_path(path), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
     with open(path, 'w', encoding='utf-8', newline='') as f:
         w = csv.writer(f)
+        if by_ref:
+            w.writerow(REF_REPORT_HEADER)
+            for rr in report:
+                # The duplicate's idx has its own column
+                reason = rr.reason.split("~", 1)[0] if rr.dup_idx is not None else rr.reason
+                w.writerow([rr.idx, "" if rr.offset is None else rr.offset, reason,
+                            "" if rr.dup_idx is None else rr.dup_idx])
+            return
         w.writerow(["idx", "reason", "input", "output"])
         for rr in report:
             w.writerow([rr.idx, rr.reason, rr.input, rr.output])
 
 
+def lint_file(inp: str, out: str, report: str, emit_features: Optional[str] = None,
+              shard: Optional[Tuple[int, int]] = None, report_by_ref: bool = False,
+              **linter_kwargs) -> Dict[str, int]:
+    """Lint + dedup one JSONL file; `linter_kwargs` go to DisfluencyLinter.
+
+    emit_features: None, "inline" (a 'features' object per kept row) or
+    "sidecar" (columnar <out>.features.json aligned by row index).
+    shard: (i, n) to lint only the i-th byte-balanced slice (dedup is per shard).
+    report_by_ref: write (idx, offset, reason, dup_idx) report rows without the text.
+    """
+    rows = read_jsonl(inp, shard=shard)
+    linter = DisfluencyLinter(emit_features=emit_features is not None, **linter_kwargs)
+
+    kept, report_rows = linter.dedup_and_lint(rows)
+
+    write_jsonl(out, kept, features=emit_features == "inline")
+    if emit_features == "sidecar":
+        write_features(features_path(out), kept)
+    write_report(report, report_rows, by_ref=report_by_ref, source=inp)
+
+    return {
+        "input_rows": len(rows),
+        "kept_rows": len(kept),
+        "removed_rows": len(report_rows)
+    }
+
+
 def main():
     ap = argparse.ArgumentParser(description="Disfluency dataset linter and deduplicator")
     ap.add_argument("--in", dest="inp", required=True, help="Path to input JSONL (input/output pairs)")
-    ap.add_argument("--out", dest="out", required=True, help="Path to write cleaned JSONL")
-    ap.add_argument("--report", dest="report", required=True, help="Path to write CSV report for removed/flagged rows")
+    ap.add_argument("--out", dest="out", required=True, help="Path to write cleaned JSONL (with --compare: rows whose verdict differs)")
+    ap.add_argument("--report", dest="report", default=None, help="Path to write CSV report for removed/flagged rows (required unless --compare)")
+    ap.add_argument("--compare", dest="compare", nargs=2, metavar=("CONFIG_A", "CONFIG_B"), default=None, help="Compare two linter configs (JSON of DisfluencyLinter options, optional 'rules' list) in one pass")
     ap.add_argument("--soft-th", dest="soft_th", type=float, default=0.92, help="Soft duplicate similarity threshold")
     ap.add_argument("--min-d", dest="min_d", type=int, default=2, help="Minimum disfluencies in input")
     ap.add_argument("--max-d", dest="max_d", type=int, default=6, help="Maximum disfluencies in input")
     ap.add_argument("--hard-dedup-only", dest="hard_dedup_only", action="store_true", help="Only remove exact duplicates; skip soft dedup and all other checks")
+    ap.add_argument("--report-by-ref", dest="report_by_ref", action="store_true", help="Report idx, byte offset, reason and duplicate idx instead of row text (read it with view_report)")
+    ap.add_argument("--shard", dest="shard", type=parse_shard, default=None, help="Lint only byte-balanced shard I/N of the input (0-based; uses the <in>.offsets index)")
+    ap.add_argument("--lint-mode", dest="lint_mode", choices=list(LINT_MODES), default="full", help="full: evaluate every check (audit report); fast: cheapest checks first, stop at the first hard violation")
+    ap.add_argument("--output-cache", dest="output_cache", type=int, default=4096, help="LRU size for memoized output-side analysis (rows sharing a clean target)")
+    ap.add_argument("--emit-features", dest="emit_features", choices=["inline", "sidecar"], default=None, help="Write disfluency_count/ratio_latin/numbers_with_units/skeleton per kept row, inline or as a columnar <out>.features.json sidecar")
 
     args = ap.parse_args()
 
-    rows = read_jsonl(args.inp)
-    linter = DisfluencyLinter(soft_dup_threshold=args.soft_th,
-                              min_disfluencies=args.min_d,
-                              max_disfluencies=args.max_d,
-                              hard_dedup_only=args.hard_dedup_only)
-
-    kept, report = linter.dedup_and_lint(rows)
+    if args.compare:
+        stats = compare_file(args.inp, args.out, *args.compare)
+        print(json.dumps(stats, ensure_ascii=False))
+        return
+    if args.report is None:
+        ap.error("--report is required unless --compare is given")
 
-    write_jsonl(args.out, kept)
-    write_report(args.report, report)
+    stats = lint_file(args.inp, args.out, args.report,
+                      emit_features=args.emit_features,
+                      shard=args.shard,
+                      report_by_ref=args.report_by_ref,
+                      soft_dup_threshold=args.soft_th,
+                      min_disfluencies=args.min_d,
+                      max_disfluencies=args.max_d,
+                      hard_dedup_only=args.hard_dedup_only,
+                      output_cache_size=args.output_cache,
+                      mode=args.lint_mode)
 
-    print(json.dumps({
-        "input_rows": len(rows),
-        "kept_rows": len(kept),
-        "removed_rows": len(report)
-    }, ensure_ascii=False))
+    print(json.dumps(stats, ensure_ascii=False))
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from .export_packed import pack_jsonl
+from .inject_noise import inject_file, parse_band, parse_histogram
+from .lint_dataset import ReportRow, iter_jsonl, lint_file, read_jsonl, row_to_json, write_report
+from .utils import canonical_pair, content_key, disfluency_count
+
+# Bump to invalidate every cached stage output
+PIPELINE_VERSION = 1
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[..., Dict]
+    deps: List[str] = field(default_factory=list)
+    # External input files, hashed by content
+    inputs: Dict[str, str] = field(default_factory=dict)
+    params: Dict = field(default_factory=dict)
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def code_digest() -> Dict[str, str]:
+    """Digest of every module of this package: stages import each other's
+    helpers transitively, so any source change invalidates every stage."""
+    return {name: file_digest(os.path.join(HERE, name))
+            for name in sorted(os.listdir(HERE)) if name.endswith(".py")}
+
+
+def stage_key(stage: Stage, dep_keys: Dict[str, str]) -> str:
+    """Content hash of a stage's inputs, upstream keys, code version and params."""
+    payload = {
+        "stage": stage.name,
+        "version": PIPELINE_VERSION,
+        "inputs": {k: file_digest(v) for k, v in sorted(stage.inputs.items())},
+        "deps": dep_keys,
+        "code": code_digest(),
+        "params": stage.params,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _rows_path(deps: Dict[str, Dict[str, str]], name: Optional[str] = None) -> str:
+    # Main row output of an upstream stage (the only one when name is None)
+    if name is None:
+        (name,) = deps.keys()
+    return deps[name]["rows"]
+
+
+def _write_rows(path: str, rows, features: bool = True) -> int:
+    n = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for r in rows:
+            f.write(json.dumps(row_to_json(r, features=features), ensure_ascii=False) + "\n")
+            n += 1
+    return n
+
+
+# ---------------------------------------------------------------- stages
+
+def stage_synthesize(inputs: Dict[str, str], deps: Dict[str, Dict[str, str]], out_dir: str, params: Dict) -> Dict:
+    p = dict(params)
+    if p.get("target_hist"):
+        p["target_hist"] = {int(k): v for k, v in p["target_hist"].items()}
+    if p.get("latin_band"):
+        p["latin_band"] = tuple(p["latin_band"])
+    stats = inject_file(inputs["seeds"], os.path.join(out_dir, "synth.noisy.jsonl"), **p)
+    return {"outputs": {"rows": "synth.noisy.jsonl"}, "rows": stats}
+
+
+def stage_lint(inputs: Dict[str, str], deps: Dict[str, Dict[str, str]], out_dir: str, params: Dict) -> Dict:
+    src = inputs["data"] if "data" in inputs else _rows_path(deps)
+    stats = lint_file(src, os.path.join(out_dir, "cleaned.jsonl"), os.path.join(out_dir, "lint_report.csv"), **params)
+    return {"outputs": {"rows": "cleaned.jsonl", "report": "lint_report.csv"}, "rows": stats}
+
+
+def stage_balance(inputs: Dict[str, str], deps: Dict[str, Dict[str, str]], out_dir: str, params: Dict) -> Dict:
+    """Merge linted sources, drop cross-source exact duplicates, cap rows per disfluency bin."""
+    max_per_bin = params.get("max_per_bin")
+    seen = set()
+    per_bin: Counter = Counter()
+    stats = {"input_rows": 0, "cross_duplicates": 0, "capped_rows": 0}
+
+    def balanced():
+        for name in deps:
+            for r in read_jsonl(_rows_path(deps, name)):
+                stats["input_rows"] += 1
+                canon = canonical_pair(r.input, r.output)
+                if canon in seen:
+                    stats["cross_duplicates"] += 1
+                    continue
+                seen.add(canon)
+                # Lint emits features inline, so the heuristics are not rerun here
+                d = r.features["disfluency_count"] if r.features else disfluency_count(r.input)
+                if max_per_bin is not None and per_bin[d] >= max_per_bin:
+                    stats["capped_rows"] += 1
+                    continue
+                per_bin[d] += 1
+                yield r
+
+    stats["kept_rows"] = _write_rows(os.path.join(out_dir, "balanced.jsonl"), balanced())
+    stats["bins"] = {str(k): v for k, v in sorted(per_bin.items())}
+    return {"outputs": {"rows": "balanced.jsonl"}, "rows": stats}
+
+
+def stage_leakage_gate(inputs: Dict[str, str], deps: Dict[str, Dict[str, str]], out_dir: str, params: Dict) -> Dict:
+    """Drop training rows whose input or output content matches the frozen eval set."""
+    eval_inputs = set()
+    eval_outputs = set()
+    if "eval_set" in inputs:
+        for r in read_jsonl(inputs["eval_set"]):
+            eval_inputs.add(content_key(r.input))
+            eval_outputs.add(content_key(r.output))
+
+    leaked: List[ReportRow] = []
+
+    def gated():
+        for r in read_jsonl(_rows_path(deps)):
+            if content_key(r.output) in eval_outputs:
+                leaked.append(ReportRow(r.idx, "eval_leak:output", r.input, r.output))
+            elif content_key(r.input) in eval_inputs:
+                leaked.append(ReportRow(r.idx, "eval_leak:input", r.input, r.output))
+            else:
+                yield r
+
+    kept = _write_rows(os.path.join(out_dir, "gated.jsonl"), gated())
+    write_report(os.path.join(out_dir, "leakage_report.csv"), leaked)
+    return {"outputs": {"rows": "gated.jsonl", "report": "leakage_report.csv"},
+            "rows": {"kept_rows": kept, "leaked_rows": len(leaked), "eval_rows": len(eval_outputs)}}
+
+
+def stage_export(inputs: Dict[str, str], deps: Dict[str, Dict[str, str]], out_dir: str, params: Dict) -> Dict:
+    rows_path = _rows_path(deps)
+    kept = _write_rows(os.path.join(out_dir, "data.cleaned.jsonl"), iter_jsonl(rows_path), features=False)
+    outputs = {"rows": "data.cleaned.jsonl"}
+    if params.get("pack"):
+        manifest = pack_jsonl(rows_path, os.path.join(out_dir, "packed", "data"),
+                             shard_rows=params.get("shard_rows"),
+                             bucket_width=params.get("bucket_width"))
+        outputs["packed"] = os.path.join("packed", "data.manifest.json")
+        return {"outputs": outputs, "rows": {"exported_rows": kept, "packed_shards": len(manifest["shards"])}}
+    return {"outputs": outputs, "rows": {"exported_rows": kept}}
+
+
+# ---------------------------------------------------------------- runner
+
+def _run_stage(fn: Callable[..., Dict], inputs: Dict[str, str], deps: Dict[str, Dict[str, str]],
+               stage_dir: str, params: Dict) -> Dict:
+    # Build into a scratch dir and rename, so only complete outputs are ever cached
+    tmp = f"{stage_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    t0 = time.perf_counter()
+    result = fn(inputs, deps, tmp, params)
+    meta = {"outputs": result["outputs"], "rows": result["rows"], "seconds": round(time.perf_counter() - t0, 3)}
+    with open(os.path.join(tmp, "meta.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    if os.path.isdir(stage_dir):
+        shutil.rmtree(stage_dir)
+    os.replace(tmp, stage_dir)
+    return meta
+
+
+def _load_meta(stage_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(stage_dir, "meta.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def run_pipeline(stages: List[Stage], cache_dir: str, jobs: int = 2, force: bool = False) -> Dict[str, Dict]:
+    """Run a stage DAG, reusing cached outputs whose key is unchanged.
+
+    Ready stages run in parallel worker processes. Returns per-stage records
+    (key, cached, seconds, rows, absolute output paths) in completion order.
+    """
+    by_name = {s.name: s for s in stages}
+    for s in stages:
+        missing = [d for d in s.deps if d not in by_name]
+        if missing:
+            raise ValueError(f"stage {s.name} depends on unknown stage(s): {', '.join(missing)}")
+
+    pending = dict(by_name)
+    done: Dict[str, Dict] = {}
+    running = {}
+
+    def finish(stage: Stage, key: str, stage_dir: str, meta: Dict, cached: bool):
+        done[stage.name] = {
+            "key": key,
+            "cached": cached,
+            "seconds": 0.0 if cached else meta["seconds"],
+            "rows": meta["rows"],
+            "outputs": {k: os.path.join(stage_dir, v) for k, v in meta["outputs"].items()},
+        }
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as ex:
+        while pending or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for name, st in list(pending.items()):
+                    if not all(d in done for d in st.deps):
+                        continue
+                    del pending[name]
+                    key = stage_key(st, {d: done[d]["key"] for d in st.deps})
+                    stage_dir = os.path.join(cache_dir, f"{st.name}-{key[:16]}")
+                    meta = None if force else _load_meta(stage_dir)
+                    if meta is not None:
+                        finish(st, key, stage_dir, meta, cached=True)
+                        progressed = True
+                        continue
+                    dep_outputs = {d: done[d]["outputs"] for d in st.deps}
+                    fut = ex.submit(_run_stage, st.fn, st.inputs, dep_outputs, stage_dir, st.params)
+                    running[fut] = (st, key, stage_dir)
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                st, key, stage_dir = running.pop(fut)
+                finish(st, key, stage_dir, fut.result(), cached=False)
+
+    return done
+
+
+def build_stages(args) -> List[Stage]:
+    lint_params = {
+        "soft_dup_threshold": args.soft_th,
+        "min_disfluencies": args.min_d,
+        "max_disfluencies": args.max_d,
+        "emit_features": "inline",
+    }
+    stages: List[Stage] = []
+    sources: List[str] = []
+    if args.data:
+        stages.append(Stage("lint_base", stage_lint, inputs={"data": args.data}, params=lint_params))
+        sources.append("lint_base")
+    if args.seeds:
+        stages.append(Stage("synthesize", stage_synthesize, inputs={"seeds": args.seeds},
+                            params={
+                                "seed": args.seed,
+                                "density": args.density,
+                                "target_hist": parse_histogram(args.target_hist) if args.target_hist else None,
+                                "latin_band": list(parse_band(args.latin_band)) if args.latin_band else None,
+                                "emit_spans": args.emit_spans,
+                            }))
+        stages.append(Stage("lint_synth", stage_lint, deps=["synthesize"], params=lint_params))
+        sources.append("lint_synth")
+    if not sources:
+        raise ValueError("nothing to do: pass --data and/or --seeds")
+
+    stages.append(Stage("balance", stage_balance, deps=sources, params={"max_per_bin": args.max_per_bin}))
+    stages.append(Stage("leakage_gate", stage_leakage_gate, deps=["balance"],
+                        inputs={"eval_set": args.eval_set} if args.eval_set else {}))
+    stages.append(Stage("export", stage_export, deps=["leakage_gate"],
+                        params={"pack": args.pack, "shard_rows": args.shard_rows, "bucket_width": args.bucket_width}))
+    return stages
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cached, resumable disfluency data pipeline: synthesize -> lint -> balance -> leakage gate -> export")
+    ap.add_argument("--data", dest="data", default=None, help="Existing JSONL of input/output pairs to lint")
+    ap.add_argument("--seeds", dest="seeds", default=None, help="JSONL of clean seeds to synthesize from")
+    ap.add_argument("--eval-set", dest="eval_set", default=None, help="Frozen golden eval JSONL; matching rows are dropped from training data")
+    ap.add_argument("--out-dir", dest="out_dir", required=True, help="Directory for final outputs and the run manifest")
+    ap.add_argument("--cache-dir", dest="cache_dir", default=None, help="Stage cache directory (default: <out-dir>/.cache)")
+    ap.add_argument("--jobs", dest="jobs", type=int, default=2, help="Stages to run in parallel")
+    ap.add_argument("--force", dest="force", action="store_true", help="Ignore cached stage outputs")
+    ap.add_argument("--soft-th", dest="soft_th", type=float, default=0.92, help="Soft duplicate similarity threshold")
+    ap.add_argument("--min-d", dest="min_d", type=int, default=2, help="Minimum disfluencies in input")
+    ap.add_argument("--max-d", dest="max_d", type=int, default=6, help="Maximum disfluencies in input")
+    ap.add_argument("--seed", dest="seed", type=int, default=42, help="Synthesis random seed")
+    ap.add_argument("--density", dest="density", type=int, default=3, help="Disfluency operations per synthesized sample")
+    ap.add_argument("--target-hist", dest="target_hist", default=None, help="Target histogram over input disfluency counts for synthesis, e.g. '2:1,3:2,4:2'")
+    ap.add_argument("--latin-band", dest="latin_band", default=None, help="Accepted ratio_latin band for targeted synthesis, e.g. '0.2,0.8'")
+    ap.add_argument("--emit-spans", dest="emit_spans", action="store_true", help="Annotate synthesized rows with inserted spans")
+    ap.add_argument("--max-per-bin", dest="max_per_bin", type=int, default=None, help="Cap on kept rows per input disfluency count")
+    ap.add_argument("--pack", dest="pack", action="store_true", help="Also export memory-mappable binary shards to <out-dir>/packed/")
+    ap.add_argument("--shard-rows", dest="shard_rows", type=int, default=None, help="Rows per packed shard (default: one shard)")
+    ap.add_argument("--bucket-width", dest="bucket_width", type=int, default=None, help="Order packed rows into length buckets of this many UTF-8 bytes")
+    args = ap.parse_args()
+
+    cache_dir = args.cache_dir or os.path.join(args.out_dir, ".cache")
+    t0 = time.perf_counter()
+    done = run_pipeline(build_stages(args), cache_dir, jobs=args.jobs, force=args.force)
+
+    # Publish final artifacts under stable names
+    os.makedirs(args.out_dir, exist_ok=True)
+    published = {
+        "data.cleaned.jsonl": done["export"]["outputs"]["rows"],
+        "data.leakage_report.csv": done["leakage_gate"]["outputs"]["report"],
+    }
+    if "lint_base" in done:
+        published["data.lint_report.csv"] = done["lint_base"]["outputs"]["report"]
+    if "lint_synth" in done:
+        published["synth.lint_report.csv"] = done["lint_synth"]["outputs"]["report"]
+    for dst, src in published.items():
+        shutil.copyfile(src, os.path.join(args.out_dir, dst))
+    if "packed" in done["export"]["outputs"]:
+        packed_dir = os.path.join(args.out_dir, "packed")
+        shutil.rmtree(packed_dir, ignore_errors=True)
+        shutil.copytree(os.path.dirname(done["export"]["outputs"]["packed"]), packed_dir)
+        published["packed/"] = packed_dir
+
+    manifest = {
+        "pipeline_version": PIPELINE_VERSION,
+        "total_seconds": round(time.perf_counter() - t0, 3),
+        "stages": {name: {k: v for k, v in rec.items() if k != "outputs"} for name, rec in done.items()},
+        "outputs": sorted(published),
+    }
+    with open(os.path.join(args.out_dir, "run_manifest.json"), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(json.dumps({name: {"cached": rec["cached"], "seconds": rec["seconds"]} for name, rec in done.items()}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
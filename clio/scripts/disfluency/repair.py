@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import random
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .lint_dataset import DisfluencyLinter, Row, iter_jsonl, row_to_json
+
+# Flags an LLM can plausibly fix; rows with any other hard reason are not sent
+REPAIRABLE = ("parenthetical_artifact", "grammar_artifact")
+# Soft reasons that do not block a repair
+IGNORED = ("too_trivial",)
+
+SYSTEM_PROMPT = (
+    "You clean up disfluent zh/en speech transcripts. For each row you get the raw "
+    "'input' and a flawed 'draft' cleanup. Return a corrected cleanup that only "
+    "deletes words from the input (fillers, repetitions, restarts, retracted "
+    "alternatives); never add, reorder or translate words, and keep numbers and "
+    "units exactly. Fix dangling conjunctions such as ', but the X, it'. Reply with "
+    "JSON only: {\"fixes\": [{\"id\": <id>, \"output\": <text>}]}."
+)
+
+
+@dataclass
+class RepairStats:
+    candidates: int = 0
+    requests: int = 0
+    retries: int = 0
+    failed_rows: int = 0
+    returned: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+
+    def summary(self) -> Dict:
+        out = asdict(self)
+        out["seconds"] = round(self.seconds, 3)
+        out["rows_per_s"] = round(self.candidates / self.seconds, 2) if self.seconds else 0.0
+        out["acceptance_rate"] = round(self.accepted / self.candidates, 4) if self.candidates else 0.0
+        return out
+
+
+def read_flagged(report_path: str) -> Dict[int, List[str]]:
+    """idx -> reasons for rows whose only hard reasons are repairable.
+
+    Works with both report formats (text and --report-by-ref): only the idx
+    and reason columns are used.
+    """
+    reasons: Dict[int, List[str]] = defaultdict(list)
+    with open(report_path, 'r', encoding='utf-8', newline='') as f:
+        for rec in csv.DictReader(f):
+            reasons[int(rec["idx"])].append(rec["reason"])
+    flagged = {}
+    for idx, rs in reasons.items():
+        hard = [r for r in rs if not r.startswith(IGNORED)]
+        if hard and all(r.startswith(REPAIRABLE) for r in hard):
+            flagged[idx] = hard
+    return flagged
+
+
+def _parse_fixes(content: str) -> Dict[int, str]:
+    # Tolerate code fences or chatter around the JSON object
+    start, end = content.find("{"), content.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("no JSON object in response")
+    obj = json.loads(content[start:end + 1])
+    return {int(fx["id"]): str(fx["output"]) for fx in obj["fixes"]}
+
+
+class RepairClient:
+    """Batched chat-completions calls with retries and exponential backoff."""
+
+    def __init__(self, session: aiohttp.ClientSession, endpoint: str, model: str,
+                 api_key: Optional[str] = None, max_retries: int = 4,
+                 backoff: float = 0.5, timeout: float = 60.0,
+                 stats: Optional[RepairStats] = None):
+        self.session = session
+        self.url = endpoint.rstrip("/") + "/chat/completions"
+        self.model = model
+        self.headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.stats = stats if stats is not None else RepairStats()
+
+    async def fix_batch(self, batch: List[Tuple[Row, List[str]]]) -> Dict[int, str]:
+        payload = {
+            "model": self.model,
+            "temperature": 0,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps({"rows": [
+                    {"id": r.idx, "input": r.input, "draft": r.output, "issues": reasons}
+                    for r, reasons in batch
+                ]}, ensure_ascii=False)},
+            ],
+        }
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats.retries += 1
+                await asyncio.sleep(self.backoff * (2 ** (attempt - 1)) * (1 + random.random()))
+            self.stats.requests += 1
+            try:
+                async with self.session.post(self.url, json=payload, headers=self.headers,
+                                             timeout=self.timeout) as resp:
+                    if resp.status == 429 or resp.status >= 500:
+                        continue
+                    if resp.status >= 400:
+                        # other client errors (bad request, auth, ...) are permanent
+                        return {}
+                    body = await resp.json(content_type=None)
+                return _parse_fixes(body["choices"][0]["message"]["content"])
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, KeyError, IndexError, TypeError):
+                continue
+        return {}
+
+
+async def repair_rows(rows: List[Tuple[Row, List[str]]],
+                      client: RepairClient,
+                      linter: DisfluencyLinter,
+                      out_f,
+                      batch_size: int = 8,
+                      concurrency: int = 4,
+                      rejects: Optional[csv.writer] = None) -> RepairStats:
+    """Send flagged rows in batches through `concurrency` workers; re-lint each
+    fix and stream accepted rows to `out_f` as batches complete."""
+    stats = client.stats
+    stats.candidates = len(rows)
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(0, len(rows), batch_size):
+        queue.put_nowait(rows[i:i + batch_size])
+
+    async def worker():
+        while True:
+            try:
+                batch = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            fixes = await client.fix_batch(batch)
+            for r, _ in batch:
+                fixed = fixes.get(r.idx)
+                if fixed is None:
+                    stats.failed_rows += 1
+                    if rejects is not None:
+                        rejects.writerow([r.idx, "repair_failed"])
+                    continue
+                stats.returned += 1
+                # The synthesis spans describe the old output, not the fix: the
+                # fix is checked as a plain delete-only edit of the input
+                cand = Row(input=r.input, output=fixed.strip(), idx=r.idx)
+                keep, reports = linter.dedup_and_lint_row(cand)
+                if keep:
+                    stats.accepted += 1
+                    out_f.write(json.dumps(row_to_json(cand, features=False), ensure_ascii=False) + "\n")
+                else:
+                    stats.rejected += 1
+                    if rejects is not None:
+                        for rr in reports:
+                            rejects.writerow([r.idx, rr.reason])
+            out_f.flush()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    stats.seconds = time.perf_counter() - t0
+    return stats
+
+
+async def repair_file(data: str, report: str, out: str, endpoint: str, model: str,
+                      api_key: Optional[str] = None, rejects: Optional[str] = None,
+                      batch_size: int = 8, concurrency: int = 4, max_retries: int = 4,
+                      backoff: float = 0.5, timeout: float = 60.0, limit: Optional[int] = None,
+                      cleaned: Optional[str] = None, **linter_kwargs) -> Dict:
+    """Repair the flagged rows of `data` and write the accepted fixes to `out`.
+
+    `cleaned` is the cleaned JSONL of the lint run that wrote `report`: its
+    rows are registered as kept before any fix is re-linted, so a fix that
+    duplicates a row already in the dataset is rejected (its
+    soft_duplicate~idx then names a line of `cleaned`).
+    """
+    flagged = read_flagged(report)
+    idxs = sorted(flagged)[:limit] if limit else sorted(flagged)
+    rows = [(r, flagged[r.idx]) for r in iter_jsonl(data, lines=idxs)]
+    linter = DisfluencyLinter(**linter_kwargs)
+    if cleaned:
+        linter.register_kept(iter_jsonl(cleaned))
+
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    rej_f = open(rejects, 'w', encoding='utf-8', newline='') if rejects else None
+    try:
+        rej_w = None
+        if rej_f is not None:
+            rej_w = csv.writer(rej_f)
+            rej_w.writerow(["idx", "reason"])
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=max(1, concurrency))) as session:
+            client = RepairClient(session, endpoint, model, api_key=api_key, max_retries=max_retries,
+                                  backoff=backoff, timeout=timeout)
+            with open(out, 'w', encoding='utf-8') as fo:
+                stats = await repair_rows(rows, client, linter, fo, batch_size=batch_size,
+                                          concurrency=concurrency, rejects=rej_w)
+    finally:
+        if rej_f is not None:
+            rej_f.close()
+    return stats.summary()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Repair rows flagged parenthetical_artifact/grammar_artifact with an OpenAI-compatible endpoint, re-linting every fix")
+    ap.add_argument("--data", dest="data", required=True, help="The JSONL that was linted")
+    ap.add_argument("--report", dest="report", required=True, help="Its lint report CSV (text or --report-by-ref)")
+    ap.add_argument("--cleaned", dest="cleaned", default=None, help="Cleaned JSONL of the same lint run; fixes are deduplicated against its rows")
+    ap.add_argument("--out", dest="out", required=True, help="Path to write accepted repaired rows (JSONL)")
+    ap.add_argument("--rejects", dest="rejects", default=None, help="Optional CSV of rejected/failed repairs (idx, reason)")
+    ap.add_argument("--endpoint", dest="endpoint", default=os.environ.get("REPAIR_ENDPOINT", "http://127.0.0.1:8000/v1"), help="OpenAI-compatible base URL (env REPAIR_ENDPOINT)")
+    ap.add_argument("--model", dest="model", default=os.environ.get("REPAIR_MODEL", "local"), help="Model name sent to the endpoint (env REPAIR_MODEL)")
+    ap.add_argument("--batch-size", dest="batch_size", type=int, default=8, help="Rows per request")
+    ap.add_argument("--concurrency", dest="concurrency", type=int, default=4, help="Requests in flight")
+    ap.add_argument("--max-retries", dest="max_retries", type=int, default=4, help="Retries per request (429/5xx/timeouts/bad JSON)")
+    ap.add_argument("--backoff", dest="backoff", type=float, default=0.5, help="Base backoff seconds (doubles per retry, with jitter)")
+    ap.add_argument("--timeout", dest="timeout", type=float, default=60.0, help="Per-request timeout seconds")
+    ap.add_argument("--limit", dest="limit", type=int, default=None, help="Repair at most N flagged rows")
+    ap.add_argument("--soft-th", dest="soft_th", type=float, default=0.92, help="Soft duplicate similarity threshold")
+    ap.add_argument("--min-d", dest="min_d", type=int, default=2, help="Minimum disfluencies in input")
+    ap.add_argument("--max-d", dest="max_d", type=int, default=6, help="Maximum disfluencies in input")
+    args = ap.parse_args()
+
+    stats = asyncio.run(repair_file(args.data, args.report, args.out, args.endpoint, args.model,
+                                    api_key=os.environ.get("OPENAI_API_KEY"),
+                                    rejects=args.rejects,
+                                    batch_size=args.batch_size,
+                                    concurrency=args.concurrency,
+                                    max_retries=args.max_retries,
+                                    backoff=args.backoff,
+                                    timeout=args.timeout,
+                                    limit=args.limit,
+                                    cleaned=args.cleaned,
+                                    soft_dup_threshold=args.soft_th,
+                                    min_disfluencies=args.min_d,
+                                    max_disfluencies=args.max_d))
+    print(json.dumps(stats, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import random
+import re
+
+from aiohttp import web
+
+# Deletes the conjunction of ", but the X, it" / "，但是…，它" drafts
+_DANGLING = [
+    (re.compile(r"(?i),\s*but\s+(the\s+[^,，。]+,\s+it\b)"), r", \1"),
+    (re.compile(r"，\s*(?:但是|不过|然而)\s*"), "，"),
+]
+
+
+def stub_fix(draft: str) -> str:
+    for pattern, repl in _DANGLING:
+        draft = pattern.sub(repl, draft)
+    return draft
+
+
+def make_app(fail_rate: float = 0.0, seed: int = 0) -> web.Application:
+    """OpenAI-compatible /v1/chat/completions stub for exercising repair.py:
+    answers every row with a rule-based fix of its draft and fails a
+    `fail_rate` share of requests with 503 to exercise retries."""
+    rng = random.Random(seed)
+
+    async def completions(request: web.Request) -> web.Response:
+        if rng.random() < fail_rate:
+            return web.Response(status=503)
+        body = await request.json()
+        rows = json.loads(body["messages"][-1]["content"])["rows"]
+        fixes = [{"id": row["id"], "output": stub_fix(row["draft"])} for row in rows]
+        return web.json_response({
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": json.dumps({"fixes": fixes}, ensure_ascii=False)}}],
+        })
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", completions)
+    return app
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local stub of an OpenAI-compatible endpoint for repair.py")
+    ap.add_argument("--host", dest="host", default="127.0.0.1")
+    ap.add_argument("--port", dest="port", type=int, default=8000)
+    ap.add_argument("--fail-rate", dest="fail_rate", type=float, default=0.0, help="Share of requests answered with 503")
+    args = ap.parse_args()
+    web.run_app(make_app(args.fail_rate), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
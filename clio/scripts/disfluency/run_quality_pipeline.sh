@@ -2,8 +2,11 @@
 set -euo pipefail
 
 # Disfluency dataset quality pipeline
-# 1) Lint + dedup existing JSONL
-# 2) (Optional) Synthesize new data from clean seeds
+# Thin wrapper around scripts.disfluency.pipeline (synthesize -> lint -> balance ->
+# leakage gate -> export). Stages are cached under $OUT_DIR/.cache and skipped
+# when their inputs, code and parameters are unchanged.
+# Optional: SEEDS=path/to/seeds.jsonl to synthesize, EVAL_SET=path/to/golden.jsonl
+# to gate leakage; extra arguments are passed through to the pipeline.
 
 ROOT_DIR="$(cd "$(dirname "$0")/../.." && pwd)"
 SYN_DIR="$ROOT_DIR/../synthetic-data"
@@ -16,11 +19,18 @@ PYTHON=${PYTHON:-python3}
 # Ensure Python can import the 'scripts' package regardless of caller CWD
 export PYTHONPATH="$ROOT_DIR:${PYTHONPATH:-}"
 
-mkdir -p "$OUT_DIR"
+EXTRA=()
+if [[ -n "${SEEDS:-}" ]]; then
+  EXTRA+=(--seeds "$SEEDS")
+fi
+if [[ -n "${EVAL_SET:-}" ]]; then
+  EXTRA+=(--eval-set "$EVAL_SET")
+fi
 
-echo "[1/1] Linting + dedup: $IN -> $CLEANED_JSONL"
-$PYTHON -m scripts.disfluency.lint_dataset --in "$IN" --out "$CLEANED_JSONL" --report "$REPORT_CSV" --soft-th 0.92 --min-d 2 --max-d 6
+echo "Running pipeline: $IN -> $OUT_DIR"
+$PYTHON -m scripts.disfluency.pipeline --data "$IN" --out-dir "$OUT_DIR" --soft-th 0.92 --min-d 2 --max-d 6 ${EXTRA[@]+"${EXTRA[@]}"} "$@"
 
 echo "Done. Outputs:"
 echo "  Cleaned JSONL: $CLEANED_JSONL"
 echo "  Report CSV:    $REPORT_CSV"
+echo "  Run manifest:  $OUT_DIR/run_manifest.json"
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import os
+import random
+import sys
+from typing import Dict, List
+
+from .jsonl_index import LineIndex
+
+
+def sample_lines(index: LineIndex, n: int, seed: int = 42) -> List[int]:
+    """Uniform sample (without replacement) of non-blank 0-based lines, in file order."""
+    candidates = index.nonblank()
+    picked = random.Random(seed).sample(candidates, min(n, len(candidates)))
+    return sorted(picked)
+
+
+def write_lines(index: LineIndex, lines: List[int], out: str) -> int:
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, 'wb') as fo:
+        for _, raw in index.lines(lines):
+            fo.write(raw if raw.endswith(b"\n") else raw + b"\n")
+    return len(lines)
+
+
+def write_shards(index: LineIndex, num_shards: int, out_prefix: str) -> List[Dict]:
+    """Split into byte-balanced shards by copying whole-line byte ranges."""
+    os.makedirs(os.path.dirname(out_prefix) or ".", exist_ok=True)
+    shards = []
+    with open(index.path, 'rb') as fi:
+        for k in range(num_shards):
+            first, last = index.shard_range(k, num_shards)
+            begin, end = index.byte_range(first, last)
+            path = f"{out_prefix}-{k:05d}.jsonl"
+            fi.seek(begin)
+            with open(path, 'wb') as fo:
+                remaining = end - begin
+                while remaining > 0:
+                    block = fi.read(min(remaining, 1 << 20))
+                    fo.write(block)
+                    remaining -= len(block)
+            # First row of a shard keeps its line number in the source: idx = first_line + row
+            shards.append({"path": path, "first_line": first + 1, "lines": last - first, "bytes": end - begin})
+    return shards
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Random access, sampling and sharding of JSONL via the <file>.offsets index")
+    ap.add_argument("--in", dest="inp", required=True, help="Path to a JSONL file")
+    ap.add_argument("--rows", dest="rows", default=None, help="Print the rows at these 1-based line numbers, e.g. '17,2048' (the idx used in lint reports)")
+    ap.add_argument("--n", dest="n", type=int, default=None, help="Write a uniform random sample of N rows to --out")
+    ap.add_argument("--seed", dest="seed", type=int, default=42, help="Sampling seed")
+    ap.add_argument("--shards", dest="shards", type=int, default=None, help="Split into N byte-balanced shards written as <out>-NNNNN.jsonl")
+    ap.add_argument("--out", dest="out", default=None, help="Output path (--n) or prefix (--shards)")
+    ap.add_argument("--rebuild", dest="rebuild", action="store_true", help="Rebuild the offsets index even if it is current")
+    args = ap.parse_args()
+
+    if (args.n is not None or args.shards is not None) and not args.out:
+        ap.error("--out is required with --n/--shards")
+
+    with (LineIndex.build(args.inp) if args.rebuild else LineIndex.open(args.inp)) as index:
+        if args.rows:
+            try:
+                line_nos = [int(x) for x in args.rows.split(",")]
+            except ValueError:
+                ap.error(f"--rows expects comma-separated line numbers, got {args.rows!r}")
+            for line_no in line_nos:
+                if not 1 <= line_no <= len(index):
+                    ap.error(f"row idx {line_no} out of range 1..{len(index)} for {args.inp}")
+            for line_no in line_nos:
+                sys.stdout.write(index.line(line_no - 1).decode('utf-8').rstrip("\n") + "\n")
+        if args.n is not None:
+            written = write_lines(index, sample_lines(index, args.n, args.seed), args.out)
+            print(json.dumps({"lines": len(index), "sampled_rows": written}, ensure_ascii=False))
+        if args.shards is not None:
+            print(json.dumps({"lines": len(index), "shards": write_shards(index, args.shards, args.out)}, ensure_ascii=False))
+        if not (args.rows or args.n is not None or args.shards is not None):
+            print(json.dumps({"lines": len(index), "bytes": index.offsets[-1], "index": os.path.basename(args.inp) + ".offsets"}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import csv
+import json
+import os
+import random
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from .inject_noise import (
+    DensityTarget,
+    parse_band,
+    parse_histogram,
+    read_seeds,
+    synthesize,
+    synthesize_targeted,
+    synthesize_with_spans,
+)
+from .lint_dataset import DisfluencyLinter, ReportRow, Row, row_to_json
+
+
+@dataclass
+class SynthStats:
+    seeds: int = 0
+    attempts: int = 0
+    kept: int = 0
+    rejected: int = 0
+    off_target: int = 0
+    passes: int = 0
+
+
+def synthesize_and_lint(cleans: List[str],
+                        linter: DisfluencyLinter,
+                        target: int,
+                        seed: int = 42,
+                        density: int = 3,
+                        max_attempts: int = 5,
+                        max_passes: int = 3,
+                        stats: Optional[SynthStats] = None,
+                        target_dist: Optional[DensityTarget] = None,
+                        max_tries: int = 8,
+                        annotate: bool = False) -> Iterator[Tuple[Optional[Row], List[ReportRow]]]:
+    """Generate noisy/clean pairs and lint them in memory.
+
+    Each clean sentence gets up to `max_attempts` fresh seeds per pass until one
+    candidate survives dedup + lint. Passes over the seed list repeat until
+    `target` rows are kept, a pass adds nothing, or `max_passes` is reached.
+    With `target_dist`, each attempt rejection-samples operator plans (up to
+    `max_tries`) toward under-filled disfluency bins before linting; a bin is
+    only counted once the linter keeps the row. With `annotate`, rows carry
+    their inserted spans and the linter verifies them instead of diffing tokens.
+    Yields (kept row or None, report rows) per attempt; row idx is the attempt number.
+    """
+    stats = stats if stats is not None else SynthStats()
+    stats.seeds = len(cleans)
+    rng = random.Random(seed)
+
+    while stats.kept < target and stats.passes < max_passes:
+        stats.passes += 1
+        kept_before = stats.kept
+        for clean in cleans:
+            if stats.kept >= target:
+                break
+            for _ in range(max_attempts):
+                stats.attempts += 1
+                dcount = None
+                spans = None
+                if target_dist is None:
+                    seed_i = rng.randint(0, 10_000_000)
+                    if annotate:
+                        noisy, spans = synthesize_with_spans(clean, seed=seed_i, density=density)
+                    else:
+                        noisy = synthesize(clean, seed=seed_i, density=density)
+                else:
+                    hit = synthesize_targeted(clean, rng, target_dist, density=density,
+                                              max_tries=max_tries, annotate=annotate)
+                    if hit is None:
+                        stats.off_target += 1
+                        continue
+                    noisy, spans, dcount = hit
+                row = Row(input=noisy, output=clean, idx=stats.attempts, spans=spans)
+                keep, reports = linter.dedup_and_lint_row(row)
+                if keep:
+                    stats.kept += 1
+                    if target_dist is not None:
+                        target_dist.record(dcount)
+                    yield row, reports
+                    break
+                stats.rejected += 1
+                yield None, reports
+        if stats.kept == kept_before:
+            break
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Synthesize disfluent pairs from clean seeds and lint them in one pass")
+    ap.add_argument("--in", dest="inp", required=True, help="Path to JSONL of clean sentences (expects {'clean': str} per line or {'output': str})")
+    ap.add_argument("--out", dest="out", required=True, help="Path to write cleaned JSONL with {'input','output'} pairs")
+    ap.add_argument("--report", dest="report", required=True, help="Path to write CSV report for rejected attempts")
+    ap.add_argument("--target", dest="target", type=int, default=None, help="Number of clean pairs to produce (default: one per seed)")
+    ap.add_argument("--seed", dest="seed", type=int, default=42, help="Global random seed")
+    ap.add_argument("--density", dest="density", type=int, default=3, help="Disfluency operations per sample")
+    ap.add_argument("--max-attempts", dest="max_attempts", type=int, default=5, help="Seeds tried per clean sentence before moving on")
+    ap.add_argument("--max-passes", dest="max_passes", type=int, default=3, help="Maximum passes over the seed list")
+    ap.add_argument("--target-hist", dest="target_hist", default=None, help="Target histogram over input disfluency counts, e.g. '2:1,3:2,4:2,5:1'")
+    ap.add_argument("--latin-band", dest="latin_band", default=None, help="Accepted ratio_latin band for targeted synthesis, e.g. '0.2,0.8'")
+    ap.add_argument("--max-tries", dest="max_tries", type=int, default=8, help="Candidates sampled per attempt in targeted mode")
+    ap.add_argument("--emit-spans", dest="emit_spans", action="store_true", help="Add a 'spans' field with inserted [start, end, op] character spans of the input")
+    ap.add_argument("--soft-th", dest="soft_th", type=float, default=0.92, help="Soft duplicate similarity threshold")
+    ap.add_argument("--min-d", dest="min_d", type=int, default=2, help="Minimum disfluencies in input")
+    ap.add_argument("--max-d", dest="max_d", type=int, default=6, help="Maximum disfluencies in input")
+    args = ap.parse_args()
+
+    cleans = list(read_seeds(args.inp))
+    target = args.target if args.target is not None else len(cleans)
+    linter = DisfluencyLinter(soft_dup_threshold=args.soft_th,
+                              min_disfluencies=args.min_d,
+                              max_disfluencies=args.max_d)
+
+    target_dist = None
+    if args.target_hist:
+        target_dist = DensityTarget(parse_histogram(args.target_hist), target,
+                                    parse_band(args.latin_band) if args.latin_band else None)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    os.makedirs(os.path.dirname(args.report) or ".", exist_ok=True)
+
+    stats = SynthStats()
+    with open(args.out, 'w', encoding='utf-8') as fo, open(args.report, 'w', encoding='utf-8', newline='') as fr:
+        w = csv.writer(fr)
+        w.writerow(["idx", "reason", "input", "output"])
+        for row, reports in synthesize_and_lint(cleans, linter, target,
+                                                seed=args.seed,
+                                                density=args.density,
+                                                max_attempts=args.max_attempts,
+                                                max_passes=args.max_passes,
+                                                stats=stats,
+                                                target_dist=target_dist,
+                                                max_tries=args.max_tries,
+                                                annotate=args.emit_spans):
+            if row is not None:
+                fo.write(json.dumps(row_to_json(row), ensure_ascii=False) + "\n")
+            for rr in reports:
+                w.writerow([rr.idx, rr.reason, rr.input, rr.output])
+
+    print(json.dumps({
+        "seeds": stats.seeds,
+        "target_rows": target,
+        "attempts": stats.attempts,
+        "kept_rows": stats.kept,
+        "rejected_attempts": stats.rejected,
+        "off_target_attempts": stats.off_target,
+        "passes": stats.passes,
+    }, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
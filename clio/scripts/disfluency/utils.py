@@ -2,10 +2,14 @@
 # -*- coding: utf-8 -*-
 
 import re
+import sys
 import unicodedata
 from collections import Counter
 from difflib import SequenceMatcher
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
+
+# Inserted character span in a noisy input: (start, end, operator)
+Span = Tuple[int, int, str]
 
 ZH_FILLERS = [
     "嗯", "呃", "啊", "那个", "就是", "怎么说", "就是说", "那什么", "额", "哎", "你知道吧"
@@ -114,60 +118,96 @@ def strip_fillers(s: str) -> str:
     return t.strip()
 
 
-def tokenize(s: str) -> List[str]:
-    tokens: List[str] = []
-    buf = []
+def tokenize_with_offsets(s: str) -> List[Tuple[str, int, int]]:
+    """Tokenize like `tokenize`, returning (token, start, end) character offsets."""
+    tokens: List[Tuple[str, int, int]] = []
+    start = 0
     mode = None  # 'latin', 'digit', 'cjk', 'other'
 
-    def flush():
-        nonlocal buf, tokens
-        if buf:
-            tokens.append("".join(buf))
-            buf = []
-
-    for ch in s:
-        cat = unicodedata.category(ch)
+    for i, ch in enumerate(s):
         if is_cjk(ch):
-            flush()
-            tokens.append(ch)
+            if mode is not None:
+                tokens.append((s[start:i], start, i))
+            tokens.append((ch, i, i + 1))
             mode = None
         elif ch.isalpha():
-            if mode == 'latin':
-                buf.append(ch)
-            else:
-                flush()
-                buf = [ch]
+            if mode != 'latin':
+                if mode is not None:
+                    tokens.append((s[start:i], start, i))
+                start = i
                 mode = 'latin'
         elif ch.isdigit():
-            if mode in ('latin', 'digit'):
-                buf.append(ch)
-                mode = 'latin' if mode == 'latin' else 'digit'
-            else:
-                flush()
-                buf = [ch]
+            if mode not in ('latin', 'digit'):
+                if mode is not None:
+                    tokens.append((s[start:i], start, i))
+                start = i
                 mode = 'digit'
         else:
             # punctuation or other
-            flush()
-            tokens.append(ch)
+            if mode is not None:
+                tokens.append((s[start:i], start, i))
+            tokens.append((ch, i, i + 1))
             mode = None
-    flush()
+    if mode is not None:
+        tokens.append((s[start:], start, len(s)))
     return tokens
 
 
+def tokenize(s: str) -> List[str]:
+    return [t for t, _, _ in tokenize_with_offsets(s)]
+
+
 def is_punct(tok: str) -> bool:
     return len(tok) == 1 and (tok in PUNCT_CHARS or unicodedata.category(tok).startswith('P'))
 
 
-def token_multiset(s: str) -> Counter:
+def content_tokens(s: str) -> List[Tuple[str, int, int]]:
+    """Lowercased, interned non-punctuation tokens of normalize_text(s), with
+    (start, end) offsets into the normalized string."""
     s_norm = normalize_text(s)
-    toks = [t.lower() for t in tokenize(s_norm) if not is_punct(t)]
-    return Counter(toks)
+    return [(sys.intern(t.lower()), start, end)
+            for t, start, end in tokenize_with_offsets(s_norm) if not is_punct(t)]
+
+
+def token_multiset(s: str) -> Counter:
+    return Counter(t for t, _, _ in content_tokens(s))
+
+
+def deleted_spans(inp_toks: List[Tuple[str, int, int]],
+                  out_toks: List[Tuple[str, int, int]]) -> Optional[List[Tuple[int, int]]]:
+    """Delete-only alignment of two `content_tokens` sequences.
+
+    Greedy two-pointer: returns the (start, end) input spans of the deleted
+    tokens (adjacent deletions merged) if the output is a subsequence of the
+    input, else None. Unlike the multiset diff this rejects reorderings.
+    """
+    spans: List[Tuple[int, int]] = []
+    n_out = len(out_toks)
+    j = 0
+    run_start = run_end = -1
+    for tok, start, end in inp_toks:
+        if j < n_out and tok == out_toks[j][0]:
+            j += 1
+            if run_start >= 0:
+                spans.append((run_start, run_end))
+                run_start = -1
+            continue
+        if run_start < 0:
+            run_start = start
+        run_end = end
+    if j < n_out:
+        return None
+    if run_start >= 0:
+        spans.append((run_start, run_end))
+    return spans
 
 
 def new_tokens_in_output(inp: str, out: str) -> List[str]:
-    ci = token_multiset(inp)
-    co = token_multiset(out)
+    return new_tokens(token_multiset(inp), token_multiset(out))
+
+
+def new_tokens(ci: Counter, co: Counter) -> List[str]:
+    """Tokens of multiset `co` that occur more often than in `ci`."""
     new_tokens = []
     for tok, cnt in co.items():
         if ci.get(tok, 0) < cnt:
@@ -175,6 +215,40 @@ def new_tokens_in_output(inp: str, out: str) -> List[str]:
     return new_tokens
 
 
+def content_key(s: str) -> str:
+    """Lowercased alphanumeric skeleton; ignores punctuation, spacing and width variants."""
+    return "".join(ch for ch in unicodedata.normalize("NFKC", s).lower() if ch.isalnum())
+
+
+def verify_spans(inp: str, out: str, spans: List[Span]) -> bool:
+    """Check that deleting the annotated spans from `inp` yields `out`'s content.
+
+    Spans must be sorted, non-overlapping and in bounds. This replaces the
+    token-multiset diff for annotated rows and also rejects reorderings.
+    """
+    pieces = []
+    cursor = 0
+    for start, end, _ in spans:
+        if start < cursor or end < start or end > len(inp):
+            return False
+        pieces.append(inp[cursor:start])
+        cursor = end
+    pieces.append(inp[cursor:])
+    return content_key("".join(pieces)) == content_key(out)
+
+
+def span_labels(s: str, spans: List[Span]) -> List[Tuple[str, Optional[str]]]:
+    """Token-level labels from character spans: (token, operator or None if kept)."""
+    labels: List[Tuple[str, Optional[str]]] = []
+    j = 0
+    for tok, start, end in tokenize_with_offsets(s):
+        while j < len(spans) and spans[j][1] <= start:
+            j += 1
+        op = spans[j][2] if j < len(spans) and spans[j][0] < end else None
+        labels.append((tok, op))
+    return labels
+
+
 def numbers_with_units(s: str) -> List[str]:
     s_norm = normalize_text(s)
     items: List[str] = []
@@ -230,13 +304,14 @@ def code_switch_ratio(s: str) -> Dict[str, float]:
     }
 
 
-def canonical_pair(inp: str, out: str) -> str:
+def canonical_text(s: str) -> str:
     # normalize and remove trivial filler spacing for exact dedup
-    a = normalize_text(strip_fillers(inp)).lower()
-    b = normalize_text(strip_fillers(out)).lower()
-    a = RE_NUMBER.sub("<NUM>", a)
-    b = RE_NUMBER.sub("<NUM>", b)
-    return a + " || " + b
+    s = normalize_text(strip_fillers(s)).lower()
+    return RE_NUMBER.sub("<NUM>", s)
+
+
+def canonical_pair(inp: str, out: str) -> str:
+    return canonical_text(inp) + " || " + canonical_text(out)
 
 
 def skeletonize(s: str) -> str:
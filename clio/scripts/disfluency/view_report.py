@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import csv
+import json
+import sys
+from typing import Dict, Iterator, Optional
+
+from .jsonl_index import LineIndex
+from .lint_dataset import REF_REPORT_HEADER, Row, parse_row, report_source_path
+
+
+def read_report_source(report_path: str) -> Optional[Dict]:
+    """Size and checksum of the linted file recorded with a by-reference
+    report, or None for reports written without them."""
+    try:
+        with open(report_source_path(report_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class RowResolver:
+    """Lazily reads rows of the linted JSONL by byte offset, or by idx through
+    the <file>.offsets index when a report row has no offset.
+
+    With `source` (see read_report_source) the file must still have the
+    recorded size and checksum; otherwise ValueError is raised.
+    """
+
+    def __init__(self, data_path: str, source: Optional[Dict] = None):
+        self.path = data_path
+        self._index: Optional[LineIndex] = None
+        if source is not None:
+            self._index = LineIndex.open(data_path)
+            size, checksum = self._index.offsets[-1], self._index.checksum.hex()
+            if (size, checksum) != (source["size"], source["checksum"]):
+                self._index.close()
+                raise ValueError(f"{data_path} changed since the report was written "
+                                 f"(size {size}, checksum {checksum}; report has size "
+                                 f"{source['size']}, checksum {source['checksum']})")
+        self._f = open(data_path, 'rb')
+
+    def at_offset(self, offset: int, idx: int) -> Optional[Row]:
+        self._f.seek(offset)
+        return parse_row(self._f.readline(), idx, offset)
+
+    def by_idx(self, idx: int) -> Optional[Row]:
+        if self._index is None:
+            self._index = LineIndex.open(self.path)
+        if not 1 <= idx <= len(self._index):
+            raise IndexError(f"row idx {idx} out of range 1..{len(self._index)} for {self.path}")
+        return self.at_offset(self._index.offsets[idx - 1], idx)
+
+    def close(self):
+        self._f.close()
+        if self._index is not None:
+            self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_ref_report(path: str) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames != REF_REPORT_HEADER:
+            raise ValueError(f"{path} is not a by-reference report (expected columns {REF_REPORT_HEADER})")
+        for rec in reader:
+            yield {
+                "idx": int(rec["idx"]),
+                "offset": int(rec["offset"]) if rec["offset"] else None,
+                "reason": rec["reason"],
+                "dup_idx": int(rec["dup_idx"]) if rec["dup_idx"] else None,
+            }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Show rows of a by-reference lint report (lint_dataset --report-by-ref), read lazily from the linted file")
+    ap.add_argument("--report", dest="report", required=True, help="By-reference CSV report")
+    ap.add_argument("--data", dest="data", required=True, help="The JSONL that was linted")
+    ap.add_argument("--reason", dest="reason", default=None, help="Only show reasons starting with this prefix, e.g. soft_duplicate")
+    ap.add_argument("--idx", dest="idx", type=int, default=None, help="Only show report rows for this row idx")
+    ap.add_argument("--limit", dest="limit", type=int, default=20, help="Maximum report rows to show (0: all)")
+    ap.add_argument("--jsonl", dest="jsonl", action="store_true", help="Print one JSON object per report row instead of text")
+    args = ap.parse_args()
+
+    source = read_report_source(args.report)
+    if source is None:
+        sys.stderr.write(f"warning: {args.report} records no size/checksum of the linted file; rows are not verified\n")
+    try:
+        rows = RowResolver(args.data, source)
+    except ValueError as e:
+        ap.error(str(e))
+
+    shown = 0
+    with rows:
+        for rec in iter_ref_report(args.report):
+            if args.reason and not rec["reason"].startswith(args.reason):
+                continue
+            if args.idx is not None and rec["idx"] != args.idx:
+                continue
+            if args.limit and shown >= args.limit:
+                break
+            try:
+                r = rows.at_offset(rec["offset"], rec["idx"]) if rec["offset"] is not None else rows.by_idx(rec["idx"])
+                dup = rows.by_idx(rec["dup_idx"]) if rec["dup_idx"] is not None else None
+            except IndexError as e:
+                ap.error(str(e))
+            if args.jsonl:
+                obj = dict(rec, input=r.input if r else None, output=r.output if r else None)
+                if dup is not None:
+                    obj["dup"] = {"input": dup.input, "output": dup.output}
+                sys.stdout.write(json.dumps(obj, ensure_ascii=False) + "\n")
+            else:
+                sys.stdout.write(f"#{rec['idx']} {rec['reason']}" + (f" (dup of #{rec['dup_idx']})" if dup is not None else "") + "\n")
+                if r is not None:
+                    sys.stdout.write(f"  input:  {r.input}\n  output: {r.output}\n")
+                if dup is not None:
+                    sys.stdout.write(f"  dup input:  {dup.input}\n  dup output: {dup.output}\n")
+            shown += 1
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ WHISPER_MODEL = tiny
 WHISPER_CLI = $(WHISPER_PREFIX)build/bin/whisper-cli
 WHISPER_FLAGS = --no-prints --language en --output-txt
 
+# Extra eval.py flags, e.g. --mixed for code-switched zh/en scoring
+EVAL_FLAGS =
+
 # You can create eval.conf to override the WHISPER_* variables
 # defined above.
 -include eval.conf
@@ -39,7 +42,7 @@ DONE = $(WHISPER_MODEL).txt
 all: $(DONE)
 
 $(DONE): $(TRANS_TXTS)
-	$(PYTHON) eval.py $(METADATA_CSV) > $@.tmp
+	$(PYTHON) eval.py $(EVAL_FLAGS) $(METADATA_CSV) > $@.tmp
 	mv $@.tmp $@
 
 # Note: This task writes to a temporary file first to
@@ -3,6 +3,10 @@ import sys
 import glob
 import jiwer
 from normalizers import EnglishTextNormalizer
+from normalizers.cache import NormalizationCache
+from normalizers.mixed import mixed_error_rate
+
+REFERENCE_CACHE = "normalized-references.sqlite"
 
 def decode_hypothesis(b):
     try:
@@ -43,23 +47,37 @@ def get_codes(metadata_csv):
             codes.append(line.split(",")[0])
     return sorted(codes)
 
+def print_mixed_error_rate(ref_orig, hyp_orig, codes):
+    # Code-switched zh/en: CJK scored per character, Latin per word
+    mer = mixed_error_rate(
+        [ref_orig[code] for code in codes], [hyp_orig[code] for code in codes]
+    )
+    print(f"MER: {mer * 100:.2f}%")
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: %s METADATA_CSV" % sys.argv[0], file=sys.stderr)
+    args = [arg for arg in sys.argv[1:] if arg != "--mixed"]
+    if len(args) < 1:
+        print("Usage: %s [--mixed] METADATA_CSV" % sys.argv[0], file=sys.stderr)
         return 1
 
-    metadata_csv = sys.argv[1]
-    normalizer = EnglishTextNormalizer()
+    metadata_csv = args[0]
 
     ref_orig = get_reference()
     hyp_orig = get_hypothesis()
 
-    ref_clean = []
-    hyp_clean = []
+    codes = get_codes(metadata_csv)
+
+    if "--mixed" in sys.argv[1:]:
+        print_mixed_error_rate(ref_orig, hyp_orig, codes)
+        return
+
+    normalizer = EnglishTextNormalizer()
 
-    for code in get_codes(metadata_csv):
-        ref_clean.append(normalizer(ref_orig[code]))
-        hyp_clean.append(normalizer(hyp_orig[code]))
+    # References never change between runs: normalize them once and reuse
+    # the results until the normalizer code changes
+    with NormalizationCache(REFERENCE_CACHE, normalizer) as cache:
+        ref_clean = cache.normalize(ref_orig[code] for code in codes)
+    hyp_clean = normalizer.batch(hyp_orig[code] for code in codes)
 
     wer = jiwer.wer(ref_clean, hyp_clean)
     print(f"WER: {wer * 100:.2f}%")
@@ -0,0 +1,236 @@
+"""
+Benchmark of the text normalizers, with a differential check of their outputs
+against a reference implementation. Run from the evaluation directory:
+
+    $ python -m normalizers.bench
+    $ python -m normalizers.bench --reference whisper.normalizers
+    $ python -m normalizers.bench --reference ../earnings21/normalizers --mismatches diff.jsonl
+
+The corpus is a seeded synthetic one, plus any LibriSpeech / earnings21 text
+found under --data. Exits with status 1 if any output differs from the
+reference.
+"""
+
+import argparse
+import glob
+import importlib
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from .basic import BasicTextNormalizer
+from .english import EnglishTextNormalizer, spelling_mapping
+
+WORDS = (
+    "the of and to in that it was for on are with as his they be at one have "
+    "this from or had by but what some we can out other were all there when up "
+    "use your how said an each she which do their time if will way about many "
+    "then them write would like so these her long make thing see him two has "
+    "look more day could go come did number sound no most people my over know "
+    "water than call first who may down side been now find revenue quarter growth "
+    "margin guidance operator question thank you"
+).split()
+NUMBERS = (
+    "twenty one", "three hundred and five", "one oh one", "two point five",
+    "a million", "five and a half", "nineteen eighty four", "the 21st", "the 3 rd",
+    "$20 million", "10%", "ten percent", "minus seven", "1,000", "3.14",
+    "five dollars and twenty cents", "$2 and ¢7", "£1.50", "the sixties",
+    "first", "second", "twelfth", "double o seven", "one two three",
+    "fourteen hundred", "eight billion", "2nd quarter", "in the 1960s",
+)
+CONTRACTIONS = (
+    "won't", "can't", "he's", "they're", "I'd been", "she's got", "y'all",
+    "gonna", "wanna", "gotta", "Mr.", "Mrs.", "Dr.", "St.", "ma'am", "isn't",
+    "we've", "I'm", "it'll", "you'd",
+)
+NOISE = (
+    "[laughter]", "<unk>", "(inaudible)", "[crosstalk]", "hmm", "um", "uh",
+    "mm", "(sp?)", "—", "…", "“quoted”", "‘single’", "&", "#", "@",
+)
+ACCENTED = ("café", "naïve", "Zoë", "Straße", "œuvre", "façade", "Ångström", "résumé")
+
+
+def synthetic_corpus(n: int = 2000, seed: int = 0) -> List[str]:
+    """`n` seeded, transcript-like texts exercising every normalizer stage."""
+    rng = random.Random(seed)
+    british = sorted(spelling_mapping())
+    pools = [
+        (WORDS, 60),
+        (NUMBERS, 10),
+        (CONTRACTIONS, 8),
+        (british, 6),
+        (NOISE, 6),
+        (ACCENTED, 3),
+        (None, 7),  # a random number in digits
+    ]
+    choices = [pool for pool, weight in pools for _ in range(weight)]
+
+    def sentence() -> str:
+        tokens = []
+        for _ in range(rng.randint(4, 24)):
+            pool = rng.choice(choices)
+            tokens.append(str(rng.randint(0, 10 ** rng.randint(1, 7))) if pool is None else rng.choice(pool))
+        tokens[0] = tokens[0][:1].upper() + tokens[0][1:]
+        return " ".join(tokens) + rng.choice((".", ".", "?", ",", "!"))
+
+    texts = []
+    for i in range(n):
+        # mostly utterance-sized texts, with a few long-form ones
+        sentences = rng.randint(40, 120) if i % 100 == 99 else rng.randint(1, 4)
+        texts.append(" ".join(sentence() for _ in range(sentences)))
+    return texts
+
+
+def local_corpus(root: str = ".") -> List[str]:
+    """Reference and hypothesis texts of local LibriSpeech / earnings21 data."""
+    texts = []
+    for path in sorted(glob.glob(os.path.join(root, "LibriSpeech/*/*/*/*.trans.txt"))):
+        with open(path) as fp:
+            texts.extend(line.strip().split(" ", 1)[-1] for line in fp if line.strip())
+    for path in sorted(glob.glob(os.path.join(root, "speech-datasets/earnings21/transcripts/nlp_references/*.nlp"))):
+        with open(path) as fp:
+            fp.readline()
+            texts.append(" ".join(line.split("|", 1)[0] for line in fp))
+    hypotheses = glob.glob(os.path.join(root, "LibriSpeech/*/*/*/*.flac.txt"))
+    hypotheses += glob.glob(os.path.join(root, "speech-datasets/earnings21/media/*.mp3.txt"))
+    for path in sorted(hypotheses):
+        with open(path, "rb") as fp:
+            texts.append(fp.read().decode("utf-8", errors="ignore").strip())
+    return texts
+
+
+def load_reference(target: str):
+    """The normalizers module at `target`: a module name or a package directory."""
+    if not os.path.isdir(target):
+        return importlib.import_module(target)
+    name = "_reference_normalizers"
+    spec = importlib.util.spec_from_file_location(
+        name,
+        os.path.join(target, "__init__.py"),
+        submodule_search_locations=[os.path.abspath(target)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _timed(fn: Callable[[str], str], texts: List[str], repeat: int):
+    best, outputs = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        outputs = [fn(text) for text in texts]
+        best = min(best, time.perf_counter() - t0)
+    return best, outputs
+
+
+def time_stages(normalizer: EnglishTextNormalizer, texts: List[str], repeat: int = 3) -> List[Dict]:
+    """Best-of-`repeat` time of each stage over the outputs of the previous one."""
+    rows = []
+    inputs = texts
+    for name, stage in normalizer.stages():
+        seconds, outputs = _timed(stage, inputs, repeat)
+        rows.append({"stage": name, "seconds": seconds, "chars": sum(map(len, inputs))})
+        inputs = outputs
+    return rows
+
+
+def _first_divergent_stage(normalizer, reference, text: str) -> Optional[str]:
+    # Feed both pipelines the same input at every stage so that the report
+    # names the stage that differs, not the first one fed a different input
+    s = text
+    for (name, stage), (_, ref_stage) in zip(normalizer.stages(), reference.stages()):
+        out = stage(s)
+        if out != ref_stage(s):
+            return name
+        s = out
+    return None
+
+
+def compare(candidates: Dict[str, Callable], references: Dict[str, Callable], texts: List[str], repeat: int = 3):
+    """Time each normalizer against its reference and collect differing outputs."""
+    timings, mismatches = [], []
+    for kind, candidate in candidates.items():
+        reference = references[kind]
+        cand_s, cand_out = _timed(candidate, texts, repeat)
+        ref_s, ref_out = _timed(reference, texts, repeat)
+        timings.append({"normalizer": kind, "seconds": cand_s, "reference_seconds": ref_s})
+        for i, (text, got, want) in enumerate(zip(texts, cand_out, ref_out)):
+            if got != want:
+                record = {"normalizer": kind, "index": i, "text": text, "reference": want, "candidate": got}
+                if hasattr(candidate, "stages") and hasattr(reference, "stages"):
+                    record["stage"] = _first_divergent_stage(candidate, reference, text)
+                mismatches.append(record)
+    return timings, mismatches
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the text normalizers and diff them against a reference")
+    ap.add_argument("--reference", default=None, help="Reference normalizers: module name (e.g. whisper.normalizers) or package directory")
+    ap.add_argument("--data", default=".", help="Directory searched for LibriSpeech / earnings21 text")
+    ap.add_argument("--synthetic", type=int, default=2000, help="Number of synthetic texts")
+    ap.add_argument("--seed", type=int, default=0, help="Seed of the synthetic corpus")
+    ap.add_argument("--repeat", type=int, default=3, help="Timing runs per measurement (best is reported)")
+    ap.add_argument("--mismatches", default=None, help="Write every differing output to this JSONL file")
+    ap.add_argument("--json", default=None, help="Write the timings to this JSON file")
+    args = ap.parse_args()
+
+    synthetic = synthetic_corpus(args.synthetic, args.seed)
+    local = local_corpus(args.data)
+    texts = synthetic + local
+    total_chars = sum(map(len, texts))
+    print(f"corpus: {len(synthetic)} synthetic + {len(local)} local texts, {total_chars / 1e6:.2f}M chars")
+
+    english = EnglishTextNormalizer()
+    stages = time_stages(english, texts, args.repeat)
+    print(f"\n{'stage':<12} {'seconds':>9} {'Mchars/s':>9}")
+    for row in stages:
+        print(f"{row['stage']:<12} {row['seconds']:>9.3f} {row['chars'] / row['seconds'] / 1e6:>9.2f}")
+    print(f"{'total':<12} {sum(row['seconds'] for row in stages):>9.3f}")
+
+    results = {"texts": len(texts), "chars": total_chars, "stages": stages}
+    mismatches = []
+    if args.reference:
+        module = load_reference(args.reference)
+        candidates = {
+            "english": english,
+            "basic": BasicTextNormalizer(),
+            "basic-diacritics": BasicTextNormalizer(remove_diacritics=True),
+        }
+        references = {
+            "english": module.EnglishTextNormalizer(),
+            "basic": module.BasicTextNormalizer(),
+            "basic-diacritics": module.BasicTextNormalizer(remove_diacritics=True),
+        }
+        timings, mismatches = compare(candidates, references, texts, args.repeat)
+        print(f"\n{'normalizer':<18} {'seconds':>9} {'reference':>10} {'speedup':>8} {'mismatches':>11}")
+        for row in timings:
+            row["mismatches"] = sum(m["normalizer"] == row["normalizer"] for m in mismatches)
+            print(
+                f"{row['normalizer']:<18} {row['seconds']:>9.3f} {row['reference_seconds']:>10.3f} "
+                f"{row['reference_seconds'] / row['seconds']:>7.2f}x {row['mismatches']:>11}"
+            )
+        for m in mismatches[:5]:
+            print(f"\n[{m['normalizer']}] stage={m.get('stage')} text={m['text'][:200]!r}")
+            print(f"  reference: {m['reference'][:200]!r}")
+            print(f"  candidate: {m['candidate'][:200]!r}")
+        results["reference"] = args.reference
+        results["normalizers"] = timings
+
+    if args.mismatches:
+        with open(args.mismatches, "w", encoding="utf-8") as fp:
+            for m in mismatches:
+                fp.write(json.dumps(m, ensure_ascii=False) + "\n")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, indent=2)
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
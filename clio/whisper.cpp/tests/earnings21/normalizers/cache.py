@@ -0,0 +1,120 @@
+import hashlib
+import os
+import sqlite3
+from typing import Iterable, List, Optional
+
+# Files whose contents determine the output of the normalizers
+SOURCE_FILES = ("basic.py", "english.py", "english.json")
+
+
+def normalizer_version() -> str:
+    """
+    Digest of the normalizer sources; any code or table change yields a new
+    version and so invalidates previously cached results.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in SOURCE_FILES:
+        with open(os.path.join(directory, name), "rb") as fp:
+            h.update(name.encode() + b"\0" + fp.read() + b"\0")
+    return h.hexdigest()
+
+
+def normalizer_id(normalizer) -> str:
+    """
+    Class of `normalizer` plus its simple settings (flags, strings, the
+    functions it was configured with), e.g. BasicTextNormalizer's
+    remove_diacritics / split_letters.
+    """
+    cls = type(normalizer)
+    settings = []
+    for name, value in sorted(vars(normalizer).items()):
+        if isinstance(value, (bool, int, float, str)):
+            settings.append(f"{name}={value!r}")
+        elif callable(value) and hasattr(value, "__qualname__"):
+            settings.append(f"{name}={value.__module__}.{value.__qualname__}")
+    return f"{cls.__module__}.{cls.__qualname__}({','.join(settings)})"
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class NormalizationCache:
+    """
+    Normalized texts persisted in one SQLite file, keyed by (text hash,
+    normalizer version). The version names the normalizer (class and settings)
+    and the digest of its code; on open, entries of the same normalizer with
+    an older code digest are dropped.
+
+        with NormalizationCache("normalized.sqlite", EnglishTextNormalizer()) as cache:
+            ref_clean = cache.normalize(references)
+    """
+
+    # Stay below SQLite's limit on bound parameters per statement
+    LOOKUP_CHUNK = 500
+
+    def __init__(self, path: str, normalizer, version: Optional[str] = None):
+        self.normalizer = normalizer
+        self.normalizer_id = normalizer_id(normalizer)
+        self.version = f"{self.normalizer_id}@{version or normalizer_version()}"
+        self.hits = 0
+        self.misses = 0
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS normalized ("
+            " version TEXT NOT NULL, key BLOB NOT NULL, text TEXT NOT NULL,"
+            " PRIMARY KEY (version, key)) WITHOUT ROWID"
+        )
+        self.db.execute(
+            "DELETE FROM normalized WHERE substr(version, 1, ?) = ? AND version != ?",
+            (len(self.normalizer_id) + 1, self.normalizer_id + "@", self.version),
+        )
+        self.db.commit()
+
+    def _lookup(self, keys: List[bytes]) -> dict:
+        found = {}
+        for i in range(0, len(keys), self.LOOKUP_CHUNK):
+            chunk = keys[i : i + self.LOOKUP_CHUNK]
+            rows = self.db.execute(
+                "SELECT key, text FROM normalized WHERE version = ? AND key IN (%s)"
+                % ",".join("?" * len(chunk)),
+                (self.version, *chunk),
+            )
+            found.update(rows)
+        return found
+
+    def normalize(self, texts: Iterable[str]) -> List[str]:
+        """Normalized `texts` in input order; only cache misses are normalized."""
+        texts = list(texts)
+        keys = [_text_key(text) for text in texts]
+        found = self._lookup(list(set(keys)))
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        self.hits += len(texts) - sum(key not in found for key in keys)
+        self.misses += len(missing)
+
+        if missing:
+            batch = getattr(self.normalizer, "batch", None)
+            sources = list(missing.values())
+            results = batch(sources) if batch else [self.normalizer(t) for t in sources]
+            found.update(zip(missing, results))
+            self.db.executemany(
+                "INSERT OR REPLACE INTO normalized (version, key, text) VALUES (?, ?, ?)",
+                [(self.version, key, found[key]) for key in missing],
+            )
+            self.db.commit()
+
+        return [found[key] for key in keys]
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,5 +1,6 @@
 import re
 import unicodedata
+from functools import lru_cache
 
 import regex
 
@@ -23,38 +24,77 @@ ADDITIONAL_DIACRITICS = {
     "Ł": "L",
 }
 
+RE_BRACKETS = re.compile(r"[<\[][^>\]]*[>\]]")
+RE_PARENS = re.compile(r"\(([^)]+?)\)")
+RE_GRAPHEME = regex.compile(r"\X", regex.U)
+RE_WHITESPACE = re.compile(r"\s+")
+
+
+class _TranslationTable(dict):
+    """`str.translate` table filled on demand: each code point is classified
+    once (by `mapper`), then served from the dict."""
+
+    def __init__(self, mapper):
+        super().__init__()
+        self.mapper = mapper
+
+    def __missing__(self, code: int) -> str:
+        result = self[code] = self.mapper(chr(code))
+        return result
+
+    def ascii_table(self) -> bytes:
+        # ASCII maps 1:1 (symbols become a space), so bytes.translate can run it
+        table = bytearray(range(256))
+        for code in range(128):
+            table[code] = ord(self[code])
+        return bytes(table)
+
+
+@lru_cache(maxsize=None)
+def _symbols_and_diacritics_tables(keep):
+    def mapper(c: str) -> str:
+        if c in keep:
+            return c
+        if c in ADDITIONAL_DIACRITICS:
+            return ADDITIONAL_DIACRITICS[c]
+        category = unicodedata.category(c)
+        if category == "Mn":
+            return ""
+        return " " if category[0] in "MSP" else c
+
+    table = _TranslationTable(mapper)
+    return table, table.ascii_table()
+
+
+@lru_cache(maxsize=None)
+def _symbols_tables():
+    table = _TranslationTable(
+        lambda c: " " if unicodedata.category(c)[0] in "MSP" else c
+    )
+    return table, table.ascii_table()
+
 
 def remove_symbols_and_diacritics(s: str, keep=""):
     """
     Replace any other markers, symbols, and punctuations with a space,
     and drop any diacritics (category 'Mn' and some manual mappings)
     """
-    return "".join(
-        (
-            c
-            if c in keep
-            else (
-                ADDITIONAL_DIACRITICS[c]
-                if c in ADDITIONAL_DIACRITICS
-                else (
-                    ""
-                    if unicodedata.category(c) == "Mn"
-                    else " " if unicodedata.category(c)[0] in "MSP" else c
-                )
-            )
-        )
-        for c in unicodedata.normalize("NFKD", s)
+    table, ascii_table = _symbols_and_diacritics_tables(
+        keep if isinstance(keep, str) else frozenset(keep)
     )
+    if s.isascii():  # NFKD leaves ASCII unchanged
+        return s.encode("ascii").translate(ascii_table).decode("ascii")
+    return unicodedata.normalize("NFKD", s).translate(table)
 
 
 def remove_symbols(s: str):
     """
     Replace any other markers, symbols, punctuations with a space, keeping diacritics
     """
-    return "".join(
-        " " if unicodedata.category(c)[0] in "MSP" else c
-        for c in unicodedata.normalize("NFKC", s)
-    )
+    table, ascii_table = _symbols_tables()
+    if s.isascii():  # NFKC leaves ASCII unchanged
+        return s.encode("ascii").translate(ascii_table).decode("ascii")
+    return unicodedata.normalize("NFKC", s).translate(table)
 
 
 class BasicTextNormalizer:
@@ -66,15 +106,13 @@ class BasicTextNormalizer:
 
     def __call__(self, s: str):
         s = s.lower()
-        s = re.sub(r"[<\[][^>\]]*[>\]]", "", s)  # remove words between brackets
-        s = re.sub(r"\(([^)]+?)\)", "", s)  # remove words between parenthesis
+        s = RE_BRACKETS.sub("", s)  # remove words between brackets
+        s = RE_PARENS.sub("", s)  # remove words between parenthesis
         s = self.clean(s).lower()
 
         if self.split_letters:
-            s = " ".join(regex.findall(r"\X", s, regex.U))
+            s = " ".join(RE_GRAPHEME.findall(s))
 
-        s = re.sub(
-            r"\s+", " ", s
-        )  # replace any successive whitespace characters with a space
+        s = RE_WHITESPACE.sub(" ", s)  # replace any successive whitespace characters with a space
 
         return s
@@ -1,13 +1,44 @@
 import json
+import marshal
 import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from fractions import Fraction
-from typing import Iterator, List, Match, Optional, Union
-
-from more_itertools import windowed
+from typing import Callable, Iterable, Iterator, List, Match, Optional, Tuple, Union
 
 from .basic import remove_symbols_and_diacritics
 
+# Token classes of EnglishNumberNormalizer.token_classes
+(
+    ZERO,
+    ONE,
+    ONE_SUFFIXED,
+    TEN,
+    TEN_SUFFIXED,
+    MULTIPLIER,
+    MULTIPLIER_SUFFIXED,
+    PRECEDING_PREFIXER,
+    FOLLOWING_PREFIXER,
+    SUFFIXER,
+    SPECIAL,
+) = range(11)
+DECIMAL_CLASSES = (ZERO, ONE, TEN)
+
+NUMERIC = re.compile(r"\d+(\.\d+)?")  # used with fullmatch
+DIGIT = re.compile(r"\d")
+AND_A_HALF = re.compile(r"\band\s+a\s+half\b")
+LETTER_DIGIT = re.compile(r"([a-z])([0-9])")
+DIGIT_LETTER = re.compile(r"([0-9])([a-z])")
+DIGIT_SPACE_SUFFIX = re.compile(r"([0-9])\s+(st|nd|rd|th|s)\b")
+CURRENCY_CENTS = re.compile(r"([€£$])([0-9]+) (?:and )?¢([0-9]{1,2})\b")
+CURRENCY_ZERO_CENTS = re.compile(r"[€£$]0.([0-9]{1,2})\b")
+LITERAL_ONE = re.compile(r"\b1(s?)\b")
+
+
+# Attributes of the first EnglishNumberNormalizer, shared by later instances
+_number_tables: Optional[dict] = None
+
 
 class EnglishNumberNormalizer:
     """
@@ -23,6 +54,16 @@ class EnglishNumberNormalizer:
     def __init__(self):
         super().__init__()
 
+        # The lookup tables are built by the first instance of the process and
+        # shared (read-only) by every later one
+        global _number_tables
+        if _number_tables is None:
+            self._build_tables()
+            _number_tables = dict(vars(self))
+        else:
+            vars(self).update(_number_tables)
+
+    def _build_tables(self):
         self.zeros = {"o", "oh", "zero"}
         self.ones = {
             name: i
@@ -162,6 +203,34 @@ class EnglishNumberNormalizer:
         )
         self.literal_words = {"one", "ones"}
 
+        # word -> (token class, payload); a word takes the first class it
+        # belongs to, in the order process_words used to test them
+        self.token_classes = {}
+        for token_class, mapping in [
+            (ZERO, dict.fromkeys(self.zeros, 0)),
+            (ONE, self.ones),
+            (ONE_SUFFIXED, self.ones_suffixed),
+            (TEN, self.tens),
+            (TEN_SUFFIXED, self.tens_suffixed),
+            (MULTIPLIER, self.multipliers),
+            (MULTIPLIER_SUFFIXED, self.multipliers_suffixed),
+            (PRECEDING_PREFIXER, self.preceding_prefixers),
+            (FOLLOWING_PREFIXER, self.following_prefixers),
+            (SUFFIXER, self.suffixers),
+            (SPECIAL, dict.fromkeys(self.specials)),
+        ]:
+            for word, payload in mapping.items():
+                self.token_classes.setdefault(word, (token_class, payload))
+
+        # Without digits, "half" or one of these words, process_words only
+        # re-joins the words: other number-related words (and, dollars,
+        # percent, ...) pass through unless a number or prefixer is nearby
+        self.trigger_words = {
+            word
+            for word, (token_class, _) in self.token_classes.items()
+            if token_class <= MULTIPLIER_SUFFIXED or token_class == PRECEDING_PREFIXER
+        } | {"point"}
+
     def process_words(self, words: List[str]) -> Iterator[str]:
         prefix: Optional[str] = None
         value: Optional[Union[str, int]] = None
@@ -185,15 +254,25 @@ class EnglishNumberNormalizer:
         if len(words) == 0:
             return
 
-        for prev, current, next in windowed([None] + words + [None], 3):
+        # One table lookup per word; (class, payload) or None for other words
+        entries = [self.token_classes.get(word) for word in words]
+        last = len(words) - 1
+
+        for i, current in enumerate(words):
             if skip:
                 skip = False
                 continue
 
-            next_is_numeric = next is not None and re.match(r"^\d+(\.\d+)?$", next)
+            entry = entries[i]
+            prev_class = entries[i - 1][0] if i > 0 and entries[i - 1] else None
+            next = words[i + 1] if i < last else None
+            next_entry = entries[i + 1] if i < last else None
+            next_class = next_entry[0] if next_entry else None
+            next_is_numeric = next is not None and NUMERIC.fullmatch(next)
+
             has_prefix = current[0] in self.prefixes
             current_without_prefix = current[1:] if has_prefix else current
-            if re.match(r"^\d+(\.\d+)?$", current_without_prefix):
+            if NUMERIC.fullmatch(current_without_prefix):
                 # arabic numbers (potentially with signs and fractions)
                 f = to_fraction(current_without_prefix)
                 assert f is not None
@@ -210,21 +289,26 @@ class EnglishNumberNormalizer:
                     value = f.numerator  # store integers as int
                 else:
                     value = current_without_prefix
-            elif current not in self.words:
+                continue
+
+            if entry is None:
                 # non-numeric words
                 if value is not None:
                     yield output(value)
                 yield output(current)
-            elif current in self.zeros:
+                continue
+
+            token_class, payload = entry
+            if token_class == ZERO:
                 value = str(value or "") + "0"
-            elif current in self.ones:
-                ones = self.ones[current]
+            elif token_class == ONE:
+                ones = payload
 
                 if value is None:
                     value = ones
-                elif isinstance(value, str) or prev in self.ones:
+                elif isinstance(value, str) or prev_class == ONE:
                     if (
-                        prev in self.tens and ones < 10
+                        prev_class == TEN and ones < 10
                     ):  # replace the last zero with the digit
                         assert value[-1] == "0"
                         value = value[:-1] + str(ones)
@@ -240,13 +324,13 @@ class EnglishNumberNormalizer:
                         value += ones
                     else:
                         value = str(value) + str(ones)
-            elif current in self.ones_suffixed:
+            elif token_class == ONE_SUFFIXED:
                 # ordinal or cardinal; yield the number right away
-                ones, suffix = self.ones_suffixed[current]
+                ones, suffix = payload
                 if value is None:
                     yield output(str(ones) + suffix)
-                elif isinstance(value, str) or prev in self.ones:
-                    if prev in self.tens and ones < 10:
+                elif isinstance(value, str) or prev_class == ONE:
+                    if prev_class == TEN and ones < 10:
                         assert value[-1] == "0"
                         yield output(value[:-1] + str(ones) + suffix)
                     else:
@@ -262,8 +346,8 @@ class EnglishNumberNormalizer:
                     else:
                         yield output(str(value) + str(ones) + suffix)
                 value = None
-            elif current in self.tens:
-                tens = self.tens[current]
+            elif token_class == TEN:
+                tens = payload
                 if value is None:
                     value = tens
                 elif isinstance(value, str):
@@ -273,9 +357,9 @@ class EnglishNumberNormalizer:
                         value += tens
                     else:
                         value = str(value) + str(tens)
-            elif current in self.tens_suffixed:
+            elif token_class == TEN_SUFFIXED:
                 # ordinal or cardinal; yield the number right away
-                tens, suffix = self.tens_suffixed[current]
+                tens, suffix = payload
                 if value is None:
                     yield output(str(tens) + suffix)
                 elif isinstance(value, str):
@@ -285,8 +369,8 @@ class EnglishNumberNormalizer:
                         yield output(str(value + tens) + suffix)
                     else:
                         yield output(str(value) + str(tens) + suffix)
-            elif current in self.multipliers:
-                multiplier = self.multipliers[current]
+            elif token_class == MULTIPLIER:
+                multiplier = payload
                 if value is None:
                     value = multiplier
                 elif isinstance(value, str) or value == 0:
@@ -301,8 +385,8 @@ class EnglishNumberNormalizer:
                     before = value // 1000 * 1000
                     residual = value % 1000
                     value = before + residual * multiplier
-            elif current in self.multipliers_suffixed:
-                multiplier, suffix = self.multipliers_suffixed[current]
+            elif token_class == MULTIPLIER_SUFFIXED:
+                multiplier, suffix = payload
                 if value is None:
                     yield output(str(multiplier) + suffix)
                 elif isinstance(value, str):
@@ -319,26 +403,26 @@ class EnglishNumberNormalizer:
                     value = before + residual * multiplier
                     yield output(str(value) + suffix)
                 value = None
-            elif current in self.preceding_prefixers:
+            elif token_class == PRECEDING_PREFIXER:
                 # apply prefix (positive, minus, etc.) if it precedes a number
                 if value is not None:
                     yield output(value)
 
-                if next in self.words or next_is_numeric:
-                    prefix = self.preceding_prefixers[current]
+                if next_entry is not None or next_is_numeric:
+                    prefix = payload
                 else:
                     yield output(current)
-            elif current in self.following_prefixers:
+            elif token_class == FOLLOWING_PREFIXER:
                 # apply prefix (dollars, cents, etc.) only after a number
                 if value is not None:
-                    prefix = self.following_prefixers[current]
+                    prefix = payload
                     yield output(value)
                 else:
                     yield output(current)
-            elif current in self.suffixers:
+            elif token_class == SUFFIXER:
                 # apply suffix symbols (percent -> '%')
                 if value is not None:
-                    suffix = self.suffixers[current]
+                    suffix = payload
                     if isinstance(suffix, dict):
                         if next in suffix:
                             yield output(str(value) + suffix[next])
@@ -350,22 +434,22 @@ class EnglishNumberNormalizer:
                         yield output(str(value) + suffix)
                 else:
                     yield output(current)
-            elif current in self.specials:
-                if next not in self.words and not next_is_numeric:
+            elif token_class == SPECIAL:
+                if next_entry is None and not next_is_numeric:
                     # apply special handling only if the next word can be numeric
                     if value is not None:
                         yield output(value)
                     yield output(current)
                 elif current == "and":
                     # ignore "and" after hundreds, thousands, etc.
-                    if prev not in self.multipliers:
+                    if prev_class != MULTIPLIER:
                         if value is not None:
                             yield output(value)
                         yield output(current)
                 elif current == "double" or current == "triple":
-                    if next in self.ones or next in self.zeros:
+                    if next_class == ONE or next_class == ZERO:
                         repeats = 2 if current == "double" else 3
-                        ones = self.ones.get(next, 0)
+                        ones = next_entry[1] if next_class == ONE else 0
                         value = str(value or "") + str(ones) * repeats
                         skip = True
                     else:
@@ -373,7 +457,7 @@ class EnglishNumberNormalizer:
                             yield output(value)
                         yield output(current)
                 elif current == "point":
-                    if next in self.decimals or next_is_numeric:
+                    if next_class in DECIMAL_CLASSES or next_is_numeric:
                         value = str(value or "") + "."
                 else:
                     # should all have been covered at this point
@@ -389,7 +473,7 @@ class EnglishNumberNormalizer:
         # replace "<number> and a half" with "<number> point five"
         results = []
 
-        segments = re.split(r"\band\s+a\s+half\b", s)
+        segments = AND_A_HALF.split(s)
         for i, segment in enumerate(segments):
             if len(segment.strip()) == 0:
                 continue
@@ -406,11 +490,11 @@ class EnglishNumberNormalizer:
         s = " ".join(results)
 
         # put a space at number/letter boundary
-        s = re.sub(r"([a-z])([0-9])", r"\1 \2", s)
-        s = re.sub(r"([0-9])([a-z])", r"\1 \2", s)
+        s = LETTER_DIGIT.sub(r"\1 \2", s)
+        s = DIGIT_LETTER.sub(r"\1 \2", s)
 
         # but remove spaces which could be a suffix
-        s = re.sub(r"([0-9])\s+(st|nd|rd|th|s)\b", r"\1\2", s)
+        s = DIGIT_SPACE_SUFFIX.sub(r"\1\2", s)
 
         return s
 
@@ -431,15 +515,21 @@ class EnglishNumberNormalizer:
                 return m.string
 
         # apply currency postprocessing; "$2 and ¢7" -> "$2.07"
-        s = re.sub(r"([€£$])([0-9]+) (?:and )?¢([0-9]{1,2})\b", combine_cents, s)
-        s = re.sub(r"[€£$]0.([0-9]{1,2})\b", extract_cents, s)
+        s = CURRENCY_CENTS.sub(combine_cents, s)
+        s = CURRENCY_ZERO_CENTS.sub(extract_cents, s)
 
         # write "one(s)" instead of "1(s)", just for the readability
-        s = re.sub(r"\b1(s?)\b", r"one\1", s)
+        s = LITERAL_ONE.sub(r"one\1", s)
 
         return s
 
     def __call__(self, s: str):
+        if "half" not in s and not DIGIT.search(s):
+            words = s.split()
+            if self.trigger_words.isdisjoint(words):
+                # fast path: no number can be formed
+                return " ".join(words)
+
         s = self.preprocess(s)
         s = " ".join(word for word in self.process_words(s.split()) if word is not None)
         s = self.postprocess(s)
@@ -447,6 +537,49 @@ class EnglishNumberNormalizer:
         return s
 
 
+_spelling_mapping: Optional[dict] = None
+
+
+def spelling_mapping() -> dict:
+    """
+    The british -> american mapping of english.json, loaded once per process.
+    The parsed mapping is cached with marshal in __pycache__, keyed by the
+    size and mtime of english.json, which loads faster than parsing the JSON.
+    """
+    global _spelling_mapping
+    if _spelling_mapping is not None:
+        return _spelling_mapping
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    mapping_path = os.path.join(directory, "english.json")
+    cache_path = os.path.join(directory, "__pycache__", "english.json.marshal")
+    st = os.stat(mapping_path)
+    key = (st.st_size, st.st_mtime_ns)
+
+    try:
+        with open(cache_path, "rb") as fp:
+            cached_key, mapping = marshal.load(fp)
+        if cached_key != key:
+            mapping = None
+    except (OSError, EOFError, ValueError, TypeError):
+        mapping = None
+
+    if mapping is None:
+        with open(mapping_path, encoding="utf-8") as fp:
+            mapping = json.load(fp)
+        try:  # best effort: the package may live on a read-only path
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as fp:
+                marshal.dump((key, mapping), fp)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    _spelling_mapping = mapping
+    return mapping
+
+
 class EnglishSpellingNormalizer:
     """
     Applies British-American spelling mappings as listed in [1].
@@ -455,13 +588,78 @@ class EnglishSpellingNormalizer:
     """
 
     def __init__(self):
-        mapping_path = os.path.join(os.path.dirname(__file__), "english.json")
-        self.mapping = json.load(open(mapping_path))
+        self.mapping = spelling_mapping()
 
     def __call__(self, s: str):
         return " ".join(self.mapping.get(word, word) for word in s.split())
 
 
+def _trie_pattern(words) -> str:
+    """Regex source matching exactly `words`, factored by common prefixes."""
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+
+RE_BRACKETS = re.compile(r"[<\[][^>\]]*[>\]]")
+RE_PARENS = re.compile(r"\(([^)]+?)\)")
+RE_SPACE_APOSTROPHE = re.compile(r"\s+'")
+RE_DIGIT_COMMA = re.compile(r"(\d),(\d)")
+RE_PERIOD = re.compile(r"\.([^0-9]|$)")
+RE_PREFIX_SYMBOL = re.compile(r"[.$¢€£]([^0-9])")
+RE_SUFFIX_PERCENT = re.compile(r"([^0-9])%")
+RE_WHITESPACE = re.compile(r"\s+")
+# Candidate cut of stream(): a whitespace run between two complete ASCII words
+RE_CUT = re.compile(r"(?<!\S)([A-Za-z]+)[ \t\r\n]+(?=([A-Za-z]+)\s)")
+RE_CLOSER = re.compile(r"[>\])]")
+
+
+# Per-process normalizer of EnglishTextNormalizer.batch() workers
+_batch_normalizer = None
+
+
+def _init_batch_worker(cls):
+    global _batch_normalizer
+    _batch_normalizer = cls()
+
+
+def _normalize_text(text: str) -> str:
+    return _batch_normalizer(text)
+
+
+def _normalize_chunk(texts: List[str]) -> List[str]:
+    return ["".join(_batch_normalizer.stream(text)) for text in texts]
+
+
+def _length_chunks(texts: List[str], n_chunks: int) -> List[List[str]]:
+    """Split `texts` into consecutive runs of roughly equal total length."""
+    target = max(1, sum(map(len, texts)) // n_chunks)
+    chunks, chunk, size = [], [], 0
+    for text in texts:
+        chunk.append(text)
+        size += len(text)
+        if size >= target:
+            chunks.append(chunk)
+            chunk, size = [], 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
 class EnglishTextNormalizer:
     def __init__(self):
         self.ignore_patterns = r"\b(hmm|mm|mhm|mmm|uh|um)\b"
@@ -520,31 +718,208 @@ class EnglishTextNormalizer:
             r"'ve\b": " have",
             r"'m\b": " am",
         }
+        # The replacers run as a few single-scan passes rather than one re.sub
+        # each: a pass compiles a run of consecutive patterns into one regex
+        # and dispatches on the matched text. A new pass starts wherever a
+        # rewrite can create a match for a later pattern: "gotta" -> "got to"
+        # feeds "'s got", "'d been" -> " had been" feeds "n't", and "n't" ->
+        # " not" feeds "'ve", "'re", ... (e.g. "'ven't").
+        self.ignore_regex = re.compile(self.ignore_patterns)
+        self.replacer_passes = []
+        barriers = {r"'d been\b", r"n't\b", r"'re\b"}
+        group = []
+        for pattern, replacement in self.replacers.items():
+            if pattern in barriers and group:
+                self.replacer_passes.append(self._compile_pass(group))
+                group = []
+            group.append((pattern, replacement))
+        self.replacer_passes.append(self._compile_pass(group))
         self.standardize_numbers = EnglishNumberNormalizer()
         self.standardize_spellings = EnglishSpellingNormalizer()
+        # Words that may interact with a neighbour: number phrases (including
+        # "and a half") and the ignored fillers, whose removal leaves a gap
+        self.context_words = self.standardize_numbers.words | {
+            "a",
+            "half",
+            *("hmm", "mm", "mhm", "mmm", "uh", "um"),
+        }
 
-    def __call__(self, s: str):
+    @staticmethod
+    def _compile_pass(group):
+        # Every replacer is a literal with \b anchors, and no two literals of a
+        # pass can match at the same position, so a prefix trie of the literals
+        # matches exactly what the patterns would (and far faster than an
+        # alternation, which re tries branch by branch at every position)
+        lead = group[0][0].startswith(r"\b")
+        literals = {}
+        for pattern, replacement in group:
+            assert pattern.startswith(r"\b") == lead and pattern.endswith(r"\b")
+            literals[pattern[2 if lead else 0:-2]] = replacement
+        regex = re.compile((r"\b" if lead else "") + _trie_pattern(literals) + r"\b")
+        return regex, lambda match: literals[match.group()]
+
+    def batch(
+        self,
+        texts: Iterable[str],
+        workers: Optional[int] = None,
+        chunks_per_worker: int = 4,
+    ) -> List[str]:
+        """
+        Normalize `texts` on a pool of `workers` processes (default: one per
+        core), returning the results in input order. Each worker builds its own
+        normalizer once; texts are sent in chunks of similar total length, and
+        long texts are normalized through stream() to bound memory.
+        """
+        texts = list(texts)
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(texts) <= 1:
+            return [self(text) for text in texts]
+
+        chunks = _length_chunks(texts, workers * chunks_per_worker)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_batch_worker,
+            initargs=(type(self),),
+        ) as pool:
+            return [text for chunk in pool.map(_normalize_chunk, chunks) for text in chunk]
+
+    def _cut(self, s: str, start: int) -> int:
+        """
+        First position >= `start` where `s` can be cut without changing the
+        output: between two plain words outside number phrases, with no
+        bracket or parenthesis removal spanning the cut. -1 if there is none.
+        """
+        pos = start
+        while True:
+            for match in RE_CUT.finditer(s, pos):
+                left, right = match.group(1).lower(), match.group(2).lower()
+                if left in self.context_words or right in self.context_words:
+                    continue
+                cut = match.end(1)
+                prefix = s[:cut]
+                # every "<"/"[" before the last ">"/"]" is removed with it
+                brackets_open = max(prefix.rfind("<"), prefix.rfind("[")) > max(
+                    prefix.rfind(">"), prefix.rfind("]")
+                )
+                if not brackets_open:
+                    if "(" not in prefix:
+                        return cut
+                    prefix = RE_BRACKETS.sub("", prefix)
+                    if prefix.rfind("(") < prefix.rfind(")"):
+                        return cut
+                # something is still open: only a later closer can help
+                break
+            else:
+                return -1
+            closer = RE_CLOSER.search(s, cut)
+            if closer is None:
+                return -1
+            pos = closer.end()
+
+    def _stream_chunks(self, pieces: Iterable[str], chunk_size: int) -> Iterator[str]:
+        parts, size, threshold = [], 0, chunk_size
+        for piece in pieces:
+            parts.append(piece)
+            size += len(piece)
+            if size < threshold:
+                continue
+            buf = "".join(parts)
+            while len(buf) >= chunk_size:
+                cut = self._cut(buf, chunk_size // 2)
+                if cut < 0:
+                    break
+                yield buf[:cut]
+                buf = buf[cut:]
+            parts, size = [buf], len(buf)
+            # no cut yet (e.g. an unclosed bracket): wait for more text
+            threshold = max(chunk_size, size + chunk_size // 2)
+        tail = "".join(parts)
+        if tail:
+            yield tail
+
+    def stream(
+        self,
+        text: Union[str, Iterable[str]],
+        chunk_size: int = 1 << 16,
+        workers: int = 1,
+    ) -> Iterator[str]:
+        """
+        Normalize a long text (a string, or an iterable of pieces such as an
+        open file) chunk by chunk, yielding outputs whose concatenation is
+        identical to normalizing the whole text at once. Chunks are cut only
+        where no rule can see across the cut, so they are about `chunk_size`
+        characters long, more if a bracket or parenthesis stays open. With
+        `workers` > 1, chunks are normalized on a process pool.
+        """
+        chunks = self._stream_chunks([text] if isinstance(text, str) else text, chunk_size)
+        if workers <= 1:
+            outputs = map(self, chunks)
+        else:
+            outputs = self._stream_parallel(chunks, workers)
+
+        # Chunks meet at a whitespace run between two words that survive
+        # normalization, which always becomes a single space
+        for i, output in enumerate(outputs):
+            yield " " + output if i else output
+
+    def _stream_parallel(self, chunks: Iterator[str], workers: int) -> Iterator[str]:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_batch_worker,
+            initargs=(type(self),),
+        ) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_normalize_text, chunk))
+                # bound the number of chunks held in memory
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def stages(self) -> List[Tuple[str, Callable[[str], str]]]:
+        """(name, function) of each normalization stage, applied in order."""
+        return [
+            ("brackets", self.remove_brackets),
+            ("replacers", self.replace),
+            ("diacritics", self.remove_symbols),
+            ("numbers", self.standardize_numbers),
+            ("spellings", self.standardize_spellings),
+            ("postprocess", self.postprocess),
+        ]
+
+    def remove_brackets(self, s: str) -> str:
         s = s.lower()
 
-        s = re.sub(r"[<\[][^>\]]*[>\]]", "", s)  # remove words between brackets
-        s = re.sub(r"\(([^)]+?)\)", "", s)  # remove words between parenthesis
-        s = re.sub(self.ignore_patterns, "", s)
-        s = re.sub(r"\s+'", "'", s)  # when there's a space before an apostrophe
-
-        for pattern, replacement in self.replacers.items():
-            s = re.sub(pattern, replacement, s)
+        s = RE_BRACKETS.sub("", s)  # remove words between brackets
+        s = RE_PARENS.sub("", s)  # remove words between parenthesis
+        s = self.ignore_regex.sub("", s)
+        s = RE_SPACE_APOSTROPHE.sub("'", s)  # when there's a space before an apostrophe
+        return s
 
-        s = re.sub(r"(\d),(\d)", r"\1\2", s)  # remove commas between digits
-        s = re.sub(r"\.([^0-9]|$)", r" \1", s)  # remove periods not followed by numbers
-        s = remove_symbols_and_diacritics(s, keep=".%$¢€£")  # keep numeric symbols
+    def replace(self, s: str) -> str:
+        for regex, replace in self.replacer_passes:
+            s = regex.sub(replace, s)
+        return s
 
-        s = self.standardize_numbers(s)
-        s = self.standardize_spellings(s)
+    def remove_symbols(self, s: str) -> str:
+        s = RE_DIGIT_COMMA.sub(r"\1\2", s)  # remove commas between digits
+        s = RE_PERIOD.sub(r" \1", s)  # remove periods not followed by numbers
+        return remove_symbols_and_diacritics(s, keep=".%$¢€£")  # keep numeric symbols
 
+    def postprocess(self, s: str) -> str:
         # now remove prefix/suffix symbols that are not preceded/followed by numbers
-        s = re.sub(r"[.$¢€£]([^0-9])", r" \1", s)
-        s = re.sub(r"([^0-9])%", r"\1 ", s)
+        s = RE_PREFIX_SYMBOL.sub(r" \1", s)
+        s = RE_SUFFIX_PERCENT.sub(r"\1 ", s)
 
-        s = re.sub(r"\s+", " ", s)  # replace any successive whitespaces with a space
+        s = RE_WHITESPACE.sub(" ", s)  # replace any successive whitespaces with a space
+        return s
 
+    def __call__(self, s: str):
+        s = self.remove_brackets(s)
+        s = self.replace(s)
+        s = self.remove_symbols(s)
+        s = self.standardize_numbers(s)
+        s = self.standardize_spellings(s)
+        s = self.postprocess(s)
         return s